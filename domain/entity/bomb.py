@@ -1,26 +1,45 @@
 import pygame
 import math
 
+from domain.entity.grid_sprite import GridSprite
 
-class Bomb(pygame.sprite.Sprite):
+
+class Bomb(GridSprite, pygame.sprite.Sprite):
     """
     Class for bomb sprite
 
     bomb has x, y and timer that says how long from placing it takes the bomb to explode
     it also has an animation
+    the explosion is scheduled by the simulation in its timer wheel (fuse), timer and animation_frame
+    are read from it, the bomb itself is not updated every tick
+    bombs are reused through the pool of the simulation, reset prepares a used bomb for a new placement
     """
+    FUSE_TICKS = 75  # 5 sekund při 15 FPS
+
     def __init__(self, x, y, iso_utils, power=2):
         super().__init__()
+        self.reset(x, y, iso_utils, power)
+
+    def reset(self, x, y, iso_utils, power=2):
         self.iso_utils = iso_utils
         self.grid_x = x
         self.grid_y = y
         self.z = 0
-        self.timer = 75  # 5 sekund při 15 FPS
         self.power = power
-        self.animation_frame = 0
-        self.create_sprite()
+        self.fuse = None  # TimerHandle výbuchu, naplánuje ho simulace
+        self.image = None
+        self.rect = None
+
+    @property
+    def timer(self):
+        """Ticks until the explosion"""
+        return self.fuse.remaining if self.fuse is not None else self.FUSE_TICKS
 
-    def create_sprite(self):
+    @property
+    def animation_frame(self):
+        return self.FUSE_TICKS - self.timer
+
+    def build_sprite(self):
         # Použij animation_frame pro smooth animaci místo skákání
         self.image = self.iso_utils.create_bomb_sprite(self.animation_frame)
         self.rect = self.image.get_rect()
@@ -31,17 +50,9 @@ class Bomb(pygame.sprite.Sprite):
         offset_x, offset_y = self.iso_utils.get_tile_center_offset()
         
         # Jemné pulsování místo skákání
-        time_left = self.timer / 75.0
+        time_left = self.timer / self.FUSE_TICKS
         pulse_intensity = (1.0 - time_left) * 0.5  # Čím méně času, tím větší pulsování
         pulse = math.sin(self.animation_frame * 0.3) * pulse_intensity
         
         self.rect.centerx = screen_x + offset_x
         self.rect.bottom = screen_y + offset_y + int(pulse * 2)  # Jemné vertikální pulsování
-
-    def update(self):
-        self.timer -= 1
-        self.animation_frame += 1
-
-        # Aktualizuj sprite
-        self.create_sprite()
-        return self.timer <= 0
@@ -4,142 +4,178 @@ import pygame
 import math
 import random
 
-import domain.entity.bomb
+from domain.entity.grid_sprite import MovingSprite
 from utils.astar import AStar
+from utils.dstar_lite import DStarLite
 
 
-class Enemy(pygame.sprite.Sprite):
+class Enemy(MovingSprite, pygame.sprite.Sprite):
     """
-    Class for enemy sprite. Has sprite, x, y, and "speed" as move_timer
+    Class for enemy sprite. Has sprite, x, y, and "speed" as move_timer (enemy thinks every THINK_INTERVAL + 1 ticks)
 
-    Is controlled by simple reflex agent combined with A* algorithm for finding shortest path to player.
+    Is controlled by simple reflex agent combined with path planning (D* Lite, shared distance field or A*) for finding shortest path to player.
     Enemy is trying to get to player if there is a path.
     When there is a bbomb or explosion to clode, enemy dodge it.
     """
+    THINK_INTERVAL = 10
+
     def __init__(self, x, y, iso_utils):
         super().__init__()
         self.iso_utils = iso_utils
         self.grid_x = x
         self.grid_y = y
+        self.prev_grid_x = x  # pozice na začátku ticku pro interpolaci při vykreslování
+        self.prev_grid_y = y
         self.z = 0
         self.animation_frame = 0
         self.move_timer = 0
-        self.create_sprite()
+        self.planner = None  # D* Lite, vytvoří se při prvním plánování
+        self.image = None
+        self.rect = None
 
-    def create_sprite(self):
+    def build_sprite(self):
         # Použij animaci frame pro sprite
         frame = int(self.animation_frame) % 4
         self.image = self.iso_utils.create_enemy_sprite(enemy_type=0, frame=frame)
         self.rect = self.image.get_rect()
         self.update_position()
 
-    def update_position(self):
-        screen_x, screen_y = self.iso_utils.grid_to_screen(self.grid_x, self.grid_y, self.z)
-        offset_x, offset_y = self.iso_utils.get_tile_center_offset()
+    def update_position(self, alpha=1.0):
+        """Places the sprite on the screen, alpha see MovingSprite.interpolated_screen_position"""
+        center_x, bottom = self.interpolated_screen_position(alpha)
         # Add floating animation
         float_offset = math.sin(self.animation_frame) * 3
-        self.rect.centerx = screen_x + offset_x
-        self.rect.bottom = screen_y + offset_y - float_offset
+        self.rect.centerx = center_x
+        self.rect.bottom = bottom - float_offset
+
+    def find_next_tile(self, game_map, goal, ai=None):
+        """
+        Returns the next tile on the shortest path from the enemy to the goal, None if there is no path
+
+        with the process-pool backend the last decision computed by the workers is used,
+        unreachable goal is recognized by the connectivity index without any search,
+        with tile costs for this tick the enemy replans incrementally with its own D* Lite planner (bomb-aware),
+        otherwise the step is read from the coordinator's distance layer of its target. Enemies the coordinator
+        has not assigned take the path from the path cache when possible and on a miss it is found via the shared
+        distance field (hierarchically via HPA* on large maps). Without the AI context the enemy searches via A*
+        """
+        start = (self.grid_x, self.grid_y)
+        if ai is None:
+            path = AStar(game_map).find_path(start, goal)
+            if len(path) > 1:
+                return path[1]
+            return None
+
+        if ai.worker_pool is not None:
+            return ai.worker_pool.get_next_tile(self)
+
+        if not ai.connectivity.same_region(start, goal):
+            return None
+
+        if ai.movement_costs is not None:
+            if self.planner is None:
+                self.planner = DStarLite(game_map)
+            return self.planner.next_tile(start, goal, ai.movement_costs)
+
+        if ai.coordinator.has_layers(self):
+            return ai.coordinator.next_tile(self)
+        return ai.path_cache.next_step(start, goal, ai.path_finder)
+
+    def update(self, game_map, grid_width, grid_height, player, ai=None):
+        """
+        Advances the enemy by one tick, thinks (see think) right away when it is due.
+        Game loop uses tick and think separately through AIScheduler.
+        """
+        if self.tick():
+            self.think(game_map, grid_width, grid_height, player, ai)
 
-    def update(self, game_map, grid_width, grid_height, player, dangers):
+    def tick(self):
+        """Advances animation and move timer, returns True when the enemy is due to think"""
+        self.animation_frame += 0.2
+        self.move_timer += 1
+        return self.move_timer > self.THINK_INTERVAL
+
+    def think(self, game_map, grid_width, grid_height, player, ai=None):
         """
         Moves of the enemy.
         If there is a path to player enemy follows the player, if not enemy tries to at least get close to the player.
-        When there is some kind of danger (bomb or explosion), the enemy waits until it disappears and then continues with following player
+        When the enemy stands in reach of a blast (bomb or explosion), it runs to the closest safe tile,
+        it also waits instead of stepping into a blast and then continues with following player
 
         Inputs:
         -------
         game_map : 2d array
-            game map, for determining valid moves and finding a path to player via A*
+            game map, for determining valid moves and finding a path to player
         grid_width : integer
             width of the map, used for determining valid moves
         grid_height : integer
             height of the map, used for determining valid moves
         player
             enemy follows the player
-        dangers
-            dangers of the game that can kill the enemy, bombs and explosions
-            enemy will dodge them and avoid getting close to them (see bomb_proximity and explosion_proximity)
+        ai : AIContext, default None
+            structures shared by all enemies (see find_next_tile)
+            its coordinator hands out tiles around the player, so the enemies flank the player
+            its danger_map is the heatmap of ticks until blast built from bombs and explosions once per tick,
+            enemy will dodge the blasts and avoid stepping into them
             bbombs are also used for validating moves, enemy cannot go through the bomb
         """
-        self.animation_frame += 0.2
-        self.move_timer += 1
-
-        if self.move_timer > 10:
-            self.move_timer = 0
-            bomb_proximity = 4
-            explosion_proximity = 2
-            danger_proximity = 4
+        self.move_timer = 0
+        dx = 0
+        dy = 0
+
+
+        # pronásledování hráče - s koordinátorem každý nepřítel míří na jiné políčko kolem hráče
+        goal = (player.grid_x, player.grid_y)
+        if ai is not None:
+            goal = ai.coordinator.get_target(self, goal)
+        try:
+            next_tile = self.find_next_tile(game_map, goal, ai)
+        except:
+            traceback.print_exc()
+            next_tile = None
+        if next_tile is not None:
+            dx = next_tile[0] - self.grid_x
+            dy = next_tile[1] - self.grid_y
+        else:  # není li cesta
+            if random.random() < 0.5:
+                if self.grid_x - player.grid_x > 0:
+                    dx = -1
+                else:
+                    dx = 1
+            else:
+                if self.grid_y - player.grid_y > 0:
+                    dy = -1
+                else:
+                    dy = 1
+
+        # vyhýbání se výbuchům podle sdílené mapy nebezpečí
+        danger_map = ai.danger_map if ai is not None else None
+        if danger_map is not None and not danger_map.is_safe(self.grid_x, self.grid_y):
+            # kudy utíkat
+            escape = danger_map.find_escape_step(self.grid_x, self.grid_y)
+            if escape is not None:
+                dx, dy = escape
+            elif (danger_map.get_time_to_blast(self.grid_x + dx, self.grid_y + dy)
+                  < danger_map.get_time_to_blast(self.grid_x, self.grid_y)):
+                # kam utéct není - nejdi aspoň tam, kam výbuch dorazí dřív
+                dx = 0
+                dy = 0
+        elif danger_map is not None and not danger_map.is_safe(self.grid_x + dx, self.grid_y + dy):
+            # nevstupuj do dosahu výbuchu, počkej až zmizí
             dx = 0
             dy = 0
 
-
-            # pronásledování hráče
-            try:
-                astar = AStar(game_map)
-                path = astar.find_path((self.grid_x, self.grid_y), (player.grid_x, player.grid_y))
-            except:
-                traceback.print_exc()
-                path = []
-            if len(path) > 1:
-                dx = path[1][0] - self.grid_x
-                dy = path[1][1] - self.grid_y
-            else:  # není li cesta
-                if random.random() < 0.5:
-                    if self.grid_x - player.grid_x > 0:
-                        dx = -1
-                    else:
-                        dx = 1
-                else:
-                    if self.grid_y - player.grid_y > 0:
-                        dy = -1
-                    else:
-                        dy = 1
-
-            for danger in sorted(dangers, key=lambda d: (d.grid_x - self.grid_x)**2 + (d.grid_y - self.grid_y)**2):
-                if type(danger) == domain.entity.bomb.Bomb:
-                    danger_proximity=bomb_proximity
-                if type(danger) == domain.entity.explosion.Explosion:
-                    danger_proximity=explosion_proximity
-
-                # jestli utíkat
-                d_x_dist=self.grid_x - danger.grid_x
-                d_y_dist=self.grid_y - danger.grid_y
-                if abs(d_x_dist) < danger_proximity and abs(d_y_dist) < danger_proximity:
-                    # kudy utíkat
-                    if abs(d_x_dist) > abs(d_y_dist):
-                        if d_x_dist > 0:
-                            dx = 1
-                        else:
-                            dx = -1
-                        break
-                    else:
-                        if d_y_dist > 0:
-                            dy = 1
-                        else:
-                            dy = -1
-                        break
-
-            new_x = self.grid_x + dx
-            new_y = self.grid_y + dy
-
-            # Kontrola hranic a stěn
-            if (0 <= new_x < grid_width and 0 <= new_y < grid_height and
-                    game_map[new_y, new_x] == 0):
-                
-                # Kontrola bomb - enemy nemůže projít políčkem s bombou
-                bomb_collision = False
-                bombs=[d for d in dangers if isinstance(d, domain.entity.bomb.Bomb)]
-                if bombs:
-                    for bomb in bombs:
-                        if bomb.grid_x == new_x and bomb.grid_y == new_y:
-                            bomb_collision = True
-                            break
-                
-                # Pohni se pouze pokud není bomba na cílovém políčku
-                if not bomb_collision:
-                    self.grid_x = new_x
-                    self.grid_y = new_y
-
-        # Aktualizuj sprite pro animaci
-        self.create_sprite()
+        new_x = self.grid_x + dx
+        new_y = self.grid_y + dy
+
+        # Kontrola hranic a stěn
+        if (0 <= new_x < grid_width and 0 <= new_y < grid_height and
+                game_map.flat[new_y * grid_width + new_x] == 0):
+            
+            # Kontrola bomb - enemy nemůže projít políčkem s bombou
+            bomb_collision = danger_map is not None and danger_map.has_bomb(new_x, new_y)
+            
+            # Pohni se pouze pokud není bomba na cílovém políčku
+            if not bomb_collision:
+                self.grid_x = new_x
+                self.grid_y = new_y
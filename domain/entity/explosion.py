@@ -1,24 +1,34 @@
-import pygame
+from domain.entity.grid_sprite import GridSprite
 
-class Explosion(pygame.sprite.Sprite):
+
+class Explosion(GridSprite):
     """
     Class for the explosion sprite(s)
 
-    when bomb explodes the bomb sprite is deleted and several explosion sprites appear
-    explosion sprites delete destroyable barriers and are harmful to the player and to enemies
+    when bomb explodes the bomb sprite is deleted and the tiles reached by the blast are set on fire
+    explosions delete destroyable barriers and are harmful to the player and to enemies
     they have animation and timer, that determines, how long the explosion takes
+    the explosions themselves live in arrays of the simulation (ExplosionField), this class is only
+    the view of one burning tile used for rendering, timer is set by the field
+    views are pooled and there may be hundreds of them in a big chain reaction, hence __slots__
     """
+    __slots__ = ('iso_utils', 'grid_x', 'grid_y', 'z', 'max_timer', 'timer', 'image', 'rect')
+    DURATION = 30
+
     def __init__(self, x, y, iso_utils):
-        super().__init__()
+        self.reset(x, y, iso_utils)
+
+    def reset(self, x, y, iso_utils):
         self.iso_utils = iso_utils
         self.grid_x = x
         self.grid_y = y
         self.z = 0
-        self.timer = 30
-        self.max_timer = 30
-        self.create_sprite()
+        self.max_timer = self.DURATION
+        self.timer = self.max_timer
+        self.image = None
+        self.rect = None
 
-    def create_sprite(self):
+    def build_sprite(self):
         frame = self.max_timer - self.timer
         self.image = self.iso_utils.create_explosion_sprite(frame, self.max_timer)
         self.rect = self.image.get_rect()
@@ -29,8 +39,3 @@ class Explosion(pygame.sprite.Sprite):
         offset_x, offset_y = self.iso_utils.get_tile_center_offset()
         self.rect.centerx = screen_x + offset_x
         self.rect.bottom = screen_y + offset_y
-
-    def update(self):
-        self.timer -= 1
-        self.create_sprite()
-        return self.timer <= 0
\ No newline at end of file
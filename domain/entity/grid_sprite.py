@@ -0,0 +1,51 @@
+class GridSprite:
+    """
+    Mixin for entities standing on a tile of the map and drawn as isometric sprites
+
+    the sprite (image and rect) is built only when the game renders the entity - create_sprite is called
+    by the drawing code, the simulation never needs it. Entities created with iso_utils=None (headless
+    GameSimulation) skip it completely, so subclasses draw their image in build_sprite without checking.
+    """
+    __slots__ = ()
+
+    def create_sprite(self):
+        if self.iso_utils is None:
+            return
+        self.build_sprite()
+
+    def build_sprite(self):
+        """Draws image and rect of the entity and places it on the screen"""
+        raise NotImplementedError
+
+
+class MovingSprite(GridSprite):
+    """
+    Mixin for entities walking tile by tile (player, enemies)
+
+    the simulation moves them once per tick, while the game draws them between the tile they stood on
+    at the start of the tick (prev_grid_x, prev_grid_y) and the current one
+    """
+    __slots__ = ()
+
+    def store_previous_position(self):
+        """Remembers the position at the start of the tick, used for interpolated rendering"""
+        self.prev_grid_x = self.grid_x
+        self.prev_grid_y = self.grid_y
+
+    def interpolated_screen_position(self, alpha=1.0):
+        """
+        Returns the screen position of the tile center the sprite is drawn at
+
+        Inputs:
+        -------
+        alpha : float
+            progress between the previous and the current tick (0 to 1), the sprite is drawn between
+            the previous and the current tile, jumps (reset after hit) are not interpolated
+        """
+        grid_x, grid_y = self.grid_x, self.grid_y
+        if abs(grid_x - self.prev_grid_x) + abs(grid_y - self.prev_grid_y) == 1:
+            grid_x = self.prev_grid_x + (grid_x - self.prev_grid_x) * alpha
+            grid_y = self.prev_grid_y + (grid_y - self.prev_grid_y) * alpha
+        screen_x, screen_y = self.iso_utils.grid_to_screen(grid_x, grid_y, self.z)
+        offset_x, offset_y = self.iso_utils.get_tile_center_offset()
+        return screen_x + offset_x, screen_y + offset_y
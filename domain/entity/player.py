@@ -1,55 +1,56 @@
 import pygame
 
+from domain.entity.grid_sprite import MovingSprite
 
-class Player(pygame.sprite.Sprite):
+
+class Player(MovingSprite, pygame.sprite.Sprite):
     """
     Class for player sprite
 
     player has x, y, can have imunity after hit, has max_boms meaning how many bombs he can place
     also has animation
     player is controlled by the user
+    immunity and powerup effects are deadlines in the timer wheel of the simulation (timers),
+    their *_timer properties read the remaining ticks, nothing is decremented every tick
     """
     def __init__(self, x, y, iso_utils):
         super().__init__()
         self.iso_utils = iso_utils
         self.grid_x = x
         self.grid_y = y
+        self.prev_grid_x = x  # pozice na začátku ticku pro interpolaci při vykreslování
+        self.prev_grid_y = y
         self.z = 0
         self.animation_frame = 0
         self.animation_timer = 0
         self.facing_direction = 1  # 1 for right, -1 for left
-        self.immunity_timer = 0  # Imunita po zásahu
+        self.timers = None  # TimerWheel simulace, nastaví ho GameSimulation
+        self.immunity = None  # TimerHandle konce imunity po zásahu
         self.bomb_placed_position = None  # Pozice kde hráč položil bombu (může z ní odejít)
         self.max_bombs = 1  # Počet bomb které může hráč mít současně
         self.current_bomb_count = 0  # Aktuální počet položených bomb
         
         # Powerup efekty
-        self.active_powerups = {}  # Slovník aktivních powerupů s časem konce
-        self.unlimited_bombs_timer = 0  # Časovač pro neomezené bomby
-        self.speed_boost_timer = 0      # Časovač pro rychlost
-        self.bigger_explosion_timer = 0  # Časovač pro větší exploze
+        self.active_powerups = {}  # Slovník aktivních powerupů (hodnota PowerUpType) s časem konce (TimerHandle)
         
-        self.create_sprite()
+        self.image = None
+        self.rect = None
 
-    def create_sprite(self):
+    def build_sprite(self):
+        flipped = self.facing_direction == -1
         # Změna barvy při immunitě (blikání)
         if self.immunity_timer > 0 and (self.immunity_timer // 5) % 2:
             # Blikání - průhlednější barva
-            self.image = self.iso_utils.create_character_sprite((0, 100, 200))
+            self.image = self.iso_utils.create_character_sprite((0, 100, 200), flipped=flipped)
         else:
             # Normální barva
-            self.image = self.iso_utils.create_character_sprite((0, 150, 255))
-        
-        if self.facing_direction == -1:
-            self.image = pygame.transform.flip(self.image, True, False)
+            self.image = self.iso_utils.create_character_sprite((0, 150, 255), flipped=flipped)
         self.rect = self.image.get_rect()
         self.update_position()
 
-    def update_position(self):
-        screen_x, screen_y = self.iso_utils.grid_to_screen(self.grid_x, self.grid_y, self.z)
-        offset_x, offset_y = self.iso_utils.get_tile_center_offset()
-        self.rect.centerx = screen_x + offset_x
-        self.rect.bottom = screen_y + offset_y
+    def update_position(self, alpha=1.0):
+        """Places the sprite on the screen, alpha see MovingSprite.interpolated_screen_position"""
+        self.rect.centerx, self.rect.bottom = self.interpolated_screen_position(alpha)
 
     def move(self, dx, dy, game_map, grid_width, grid_height, bombs=None):
         """
@@ -70,22 +71,20 @@ class Player(pygame.sprite.Sprite):
         grid_height : int
             height of the map, used for determining valid moves
         bombs, default None
-            bombs placed on the map
+            bombs placed on the map, group indexed by tile (TileGroup)
         """
         new_x = max(0, min(grid_width - 1, self.grid_x + dx))
         new_y = max(0, min(grid_height - 1, self.grid_y + dy))
 
         # Kontrola stěn
-        if game_map[new_y, new_x] != 0:
+        if game_map.flat[new_y * grid_width + new_x] != 0:
             return False
             
         # Kontrola bomb
-        if bombs:
-            for bomb in bombs:
-                if bomb.grid_x == new_x and bomb.grid_y == new_y:
-                    # Pokud se snažíme jít na bombu a není to ta bomba kterou jsme právě položili
-                    if self.bomb_placed_position != (new_x, new_y):
-                        return False
+        if bombs is not None and bombs.has(new_x, new_y):
+            # Pokud se snažíme jít na bombu a není to ta bomba kterou jsme právě položili
+            if self.bomb_placed_position != (new_x, new_y):
+                return False
         
         # Pokud se pohybujeme, zkontroluj jestli opouštíme pozici s bombou
         if self.bomb_placed_position and (self.grid_x, self.grid_y) == self.bomb_placed_position:
@@ -97,8 +96,6 @@ class Player(pygame.sprite.Sprite):
         # Update facing direction
         if dx != 0:
             self.facing_direction = 1 if dx > 0 else -1
-            self.create_sprite()
-        self.update_position()
         return True
 
     def animate(self, moving):
@@ -107,28 +104,54 @@ class Player(pygame.sprite.Sprite):
             self.animation_frame = (self.animation_frame + 1) % 4
             self.animation_timer = 0
     
-    def update(self):
-        if self.immunity_timer > 0:
-            self.immunity_timer -= 1
-            # Aktualizuj sprite pro blikání
-            self.create_sprite()
-            
-        # Update powerup timery
-        if self.unlimited_bombs_timer > 0:
-            self.unlimited_bombs_timer -= 1
-        if self.speed_boost_timer > 0:
-            self.speed_boost_timer -= 1
-        if self.bigger_explosion_timer > 0:
-            self.bigger_explosion_timer -= 1
+    def _remaining(self, handle):
+        return handle.remaining if handle is not None else 0
+
+    @property
+    def immunity_timer(self):
+        """Ticks of immunity left"""
+        return self._remaining(self.immunity)
+
+    @immunity_timer.setter
+    def immunity_timer(self, ticks):
+        self.immunity = self.timers.schedule(ticks) if ticks > 0 else None
+
+    def _set_powerup_timer(self, name, ticks):
+        self.active_powerups[name] = self.timers.schedule(ticks) if ticks > 0 else None
+
+    @property
+    def unlimited_bombs_timer(self):
+        """Časovač pro neomezené bomby"""
+        return self._remaining(self.active_powerups.get('unlimited_bombs'))
+
+    @unlimited_bombs_timer.setter
+    def unlimited_bombs_timer(self, ticks):
+        self._set_powerup_timer('unlimited_bombs', ticks)
+
+    @property
+    def speed_boost_timer(self):
+        """Časovač pro rychlost"""
+        return self._remaining(self.active_powerups.get('speed_boost'))
+
+    @speed_boost_timer.setter
+    def speed_boost_timer(self, ticks):
+        self._set_powerup_timer('speed_boost', ticks)
+
+    @property
+    def bigger_explosion_timer(self):
+        """Časovač pro větší exploze"""
+        return self._remaining(self.active_powerups.get('bigger_explosion'))
+
+    @bigger_explosion_timer.setter
+    def bigger_explosion_timer(self, ticks):
+        self._set_powerup_timer('bigger_explosion', ticks)
 
     def set_facing_direction(self, direction):
         """
         Function for setting the direction the player is facing.
         variable facing_direction is then used for animation
         """
-        if self.facing_direction != direction:
-            self.facing_direction = direction
-            self.create_sprite()
+        self.facing_direction = direction
     
     def set_bomb_placed_position(self, x, y):
         """Nastaví pozici kde hráč položil bombu"""
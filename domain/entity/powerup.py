@@ -3,6 +3,8 @@ import math
 import random
 from enum import Enum
 
+from domain.entity.grid_sprite import GridSprite
+
 
 class PowerUpType(Enum):
     UNLIMITED_BOMBS = "unlimited_bombs"  # Neomezené bomby na 5 sekund
@@ -11,15 +13,25 @@ class PowerUpType(Enum):
     BIGGER_EXPLOSION = "bigger_explosion"  # Větší exploze na 5 sekund
 
 
-class PowerUp(pygame.sprite.Sprite):
+class PowerUp(GridSprite, pygame.sprite.Sprite):
+    """
+    Class for powerup sprite
+
+    powerup disappears after LIFETIME ticks, its despawn is scheduled in the timer wheel of the simulation (expiry)
+    powerups are reused through the pool of the simulation, reset prepares a used one for a new spawn
+    """
+    LIFETIME = 450  # 30 sekund při 15 FPS
+
     def __init__(self, x, y, iso_utils, powerup_type=None):
         super().__init__()
+        self.reset(x, y, iso_utils, powerup_type)
+
+    def reset(self, x, y, iso_utils, powerup_type=None):
         self.iso_utils = iso_utils
         self.grid_x = x
         self.grid_y = y
         self.z = 0
-        self.animation_frame = 0
-        self.lifetime = 450  # 30 sekund při 15 FPS
+        self.expiry = None  # TimerHandle zmizení powerupu
         
         # Náhodný typ pokud není zadaný
         if powerup_type is None:
@@ -27,10 +39,23 @@ class PowerUp(pygame.sprite.Sprite):
         else:
             self.powerup_type = powerup_type
             
-        self.create_sprite()
+        self.image = None
+        self.rect = None
+
+    @property
+    def lifetime(self):
+        """Ticks until the powerup disappears"""
+        return self.expiry.remaining if self.expiry is not None else self.LIFETIME
 
-    def create_sprite(self):
+    @property
+    def animation_frame(self):
+        return self.LIFETIME - self.lifetime
+
+    def build_sprite(self):
         """Vytvoří sprite pro powerup"""
+        # Blikání pokud končí lifetime - sprite se v půlce fází neobnovuje
+        if self.lifetime < 90 and not (self.lifetime // 5) % 2 and self.image is not None:
+            return
         # Různé barvy pro různé typy
         colors = {
             PowerUpType.UNLIMITED_BOMBS: (255, 255, 0),    # Žlutá
@@ -74,20 +99,6 @@ class PowerUp(pygame.sprite.Sprite):
         self.rect.centerx = screen_x + offset_x
         self.rect.bottom = screen_y + offset_y - int(float_offset)
 
-    def update(self):
-        """Update powerup animace a lifetime"""
-        self.animation_frame += 1
-        self.lifetime -= 1
-        
-        # Blikání pokud končí lifetime
-        if self.lifetime < 90:  # Posledních 6 sekund
-            if (self.lifetime // 5) % 2:  # Blikání
-                self.create_sprite()
-        else:
-            self.create_sprite()
-        
-        return self.lifetime <= 0  # Vrací True pokud má zmizet
-
     def get_effect_description(self):
         """Vrátí popis efektu powerupu"""
         descriptions = {
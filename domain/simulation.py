@@ -0,0 +1,262 @@
+from enum import Enum
+
+import pygame
+
+from domain.state.ai_context import AIContext
+from domain.state.entity_pools import EntityPools
+from domain.state.explosion_field import ExplosionField
+from domain.state.occupancy import TileGroup
+from game_logic import explode_bombs, check_collisions, check_enemy_explosions, count_destructible_blocks
+from utils.ai_scheduler import AIScheduler
+from utils.blast_resolver import BlastResolver
+from utils.timer_wheel import TimerWheel
+
+
+class SimulationEvent(Enum):
+    BOMB_PLACED = "bomb_placed"              # data: bomba
+    EXPLOSION = "explosion"                  # data: seznam zničených zdí (x, y)
+    PLAYER_HIT = "player_hit"                # data: zbývající životy
+    ENEMY_HIT = "enemy_hit"                  # data: seznam zasažených nepřátel
+    POWERUP_COLLECTED = "powerup_collected"  # data: typ powerupu
+
+
+class GameSimulation:
+    """
+    Class for headless game simulation
+
+    holds the map and all entities and advances the game rules by one tick (step) - player input, bombs,
+    explosions, powerups, enemies and collisions - without any rendering or audio.
+    Everything the presentation needs to react to (sounds, particles, screen shake) is reported as events.
+    Entities created with iso_utils=None never build their sprites, so the simulation can be stepped
+    thousands of times per second (bots, testing, servers), BoomerManGame drives it for normal play.
+    """
+    def __init__(self, game_map, player, enemies=(), lives=3, score=0, iso_utils=None, ai_budget_ms=None,
+                 pools=None):
+        """
+        Inputs:
+        -------
+        game_map : 2d array
+            game map, changed in place by explosions
+        player : Player
+            the player
+        enemies
+            enemies on the map
+        lives : int
+            lives the player starts with
+        score : int
+            score the player starts with (story mode carries it over levels)
+        iso_utils : IsometricUtils, default None
+            used only for sprites of spawned entities, None for headless simulation
+        ai_budget_ms : float, default None
+            per-frame budget for thinking enemies (see AIScheduler and begin_frame), None means no limit -
+            every enemy thinks when it is due, so headless runs do not depend on the speed of the machine
+        pools : EntityPools, default None
+            pools of bombs, powerups and explosion views, the game shares one across levels,
+            None creates pools for this simulation only
+        """
+        self.game_map = game_map
+        self.grid_height, self.grid_width = game_map.shape
+        self.iso_utils = iso_utils
+        self.lives = lives
+        self.score = score
+        self.tick_count = 0
+        self.events = []
+        # výbuchy bomb, zánik explozí, zmizení powerupů a konce efektů hráče
+        self.timers = TimerWheel()
+        # bomby, kterým v tomto ticku doběhl časovač - vybuchnou najednou v resolve_detonations
+        self.detonating = []
+        self.pools = pools if pools is not None else EntityPools()
+
+        self.all_sprites = pygame.sprite.Group()
+        self.players = pygame.sprite.Group()
+        # skupiny indexované podle políčka - kolize a blokování jsou dotazy na jedno políčko
+        self.enemies = TileGroup()
+        self.bombs = TileGroup()
+        self.powerups = TileGroup()
+        # exploze jsou pole přes mapu, ne sprajty
+        self.explosions = ExplosionField(game_map.shape, self.timers, iso_utils, self.pools.explosions)
+
+        self.player = player
+        player.timers = self.timers
+        self.all_sprites.add(player)
+        self.players.add(player)
+        for enemy in enemies:
+            self.all_sprites.add(enemy)
+            self.enemies.add(enemy)
+
+        self.ai = AIContext(game_map)
+        self.blast_resolver = BlastResolver(game_map, self.ai.blast_reach)
+        self.ai_scheduler = AIScheduler(ai_budget_ms if ai_budget_ms is not None else float('inf'))
+        self.ai_scheduler.stagger(self.enemies)
+
+    def begin_frame(self):
+        """Starts a rendered frame, enemies of all steps until the next call share one AI budget"""
+        self.ai_scheduler.begin_frame()
+
+    def step(self, direction=None, place_bomb=False):
+        """
+        Advances the game by one tick
+
+        Inputs:
+        -------
+        direction : tuple, default None
+            dx and dy of the player move, None when the player stands
+        place_bomb : bool
+            player places a bomb before moving
+
+        Returns:
+        --------
+            list of (SimulationEvent, data) that happened since the previous step
+        """
+        # změny mapy se sbírají po tickách - po step obsahuje game_map.dirty jen změny tohoto ticku
+        # indexy AI si napřed převezmou změny provedené mezi ticky
+        self.ai.sync_map()
+        self.game_map.clear_dirty()
+        # pozice z minulého ticku pro interpolaci pohybu při vykreslování
+        self.player.store_previous_position()
+        for enemy in self.enemies:
+            enemy.store_previous_position()
+
+        if place_bomb:
+            self.place_bomb()
+        self.update_player(direction)
+        self.update_entities()
+        self.check_collisions()
+        self.tick_count += 1
+
+        events = self.events
+        self.events = []
+        return events
+
+    def update_player(self, direction):
+        """Processes the movement of the player and his timers"""
+        moving = False
+        if direction is not None:
+            dx, dy = direction
+            if self.player.move(dx, dy, self.game_map, self.grid_width, self.grid_height, self.bombs):
+                moving = True
+                if dx != 0:
+                    self.player.set_facing_direction(dx)
+        self.player.animate(moving)
+
+    def place_bomb(self):
+        """
+        Places a bomb under the player if he can place another one and there is no bomb yet
+
+        Returns:
+        --------
+            True if the bomb was placed
+        """
+        if not self.player.can_place_bomb():
+            return False
+
+        bomb_pos = (self.player.grid_x, self.player.grid_y)
+        if self.bombs.has(*bomb_pos):
+            return False
+
+        bomb = self.pools.bombs.acquire(bomb_pos[0], bomb_pos[1], self.iso_utils, self.player.get_bomb_power())
+        bomb.fuse = self.timers.schedule(bomb.FUSE_TICKS, self.detonate, bomb)
+        self.bombs.add(bomb)
+        self.all_sprites.add(bomb)
+        self.player.add_bomb()
+        # bomb passing - hráč může z bomby odejít
+        self.player.set_bomb_placed_position(bomb_pos[0], bomb_pos[1])
+        self.events.append((SimulationEvent.BOMB_PLACED, bomb))
+        return True
+
+    def update_entities(self):
+        """
+        Processes bombs, explosions, powerups and enemies.
+        The timer wheel fires what is due in this tick - bombs explode and expired powerups are removed,
+        finished explosions end with the tick of the wheel. Enemies think within the AI budget.
+        """
+        self.timers.advance()
+        self.resolve_detonations()
+
+        # Mapa nebezpečí a ceny políček se staví jednou za tick ze všech bomb a explozí
+        # a sdílí je všichni nepřátelé spolu s indexy mapy
+        self.ai.update(self.bombs, self.explosions, len(self.enemies))
+        for enemy in self.enemies:
+            if enemy.tick():
+                self.ai_scheduler.enqueue(enemy)
+        # cíle kolem hráče se rozdělují jedním dávkovým výpočtem, jen když někdo přemýšlí
+        if self.ai_scheduler.queue:
+            self.ai.coordinator.assign(self.player, self.enemies)
+        self.ai_scheduler.run(self.think)
+
+    def detonate(self, bomb):
+        """Timer wheel callback - the fuse of the bomb ran out, it explodes with the rest of the tick's batch"""
+        if bomb.alive():
+            self.detonating.append(bomb)
+
+    def resolve_detonations(self):
+        """
+        Explodes all bombs whose fuse ran out in this tick as one batch, bombs reached by the blast
+        explode with them (chain reaction). The whole batch is reported as one EXPLOSION event.
+        """
+        if not self.detonating:
+            return
+        detonated, destroyed_bricks, score_gain, spawned_powerups = explode_bombs(
+            self.blast_resolver, self.detonating, self.bombs, self.game_map, self.iso_utils,
+            self.explosions, self.all_sprites, self.powerups, self.pools.powerups)
+        self.detonating = []
+        for powerup in spawned_powerups:
+            # aktuální tick se počítá do doby trvání
+            powerup.expiry = self.timers.schedule(powerup.LIFETIME - 1, self.despawn_powerup, powerup)
+        self.score += score_gain
+        self.events.append((SimulationEvent.EXPLOSION, destroyed_bricks))
+        for bomb in detonated:
+            # bomby odpálené řetězem už nesmí vybuchnout podruhé
+            if bomb.fuse is not None:
+                bomb.fuse.cancel()
+            # Sníž počítadlo bomb u hráče po explozi
+            self.player.remove_bomb()
+            bomb.kill()
+            self.pools.bombs.release(bomb)
+
+    def despawn_powerup(self, powerup):
+        """Removes the powerup (collected or expired) and returns it to the pool"""
+        if powerup.expiry is not None:
+            powerup.expiry.cancel()
+        powerup.kill()
+        self.pools.powerups.release(powerup)
+
+    def think(self, enemy):
+        """Lets the enemy decide and move, keeps the occupancy index in sync"""
+        enemy.think(self.game_map, self.grid_width, self.grid_height, self.player, self.ai)
+        self.enemies.relocate(enemy)
+
+    def check_collisions(self):
+        """Processes hits of the player and enemies and collecting of powerups"""
+        self.lives, player_hit = check_collisions(self.player, self.enemies, self.explosions, self.lives, self.score)
+        if player_hit:
+            self.events.append((SimulationEvent.PLAYER_HIT, self.lives))
+
+        for powerup in list(self.powerups.at(self.player.grid_x, self.player.grid_y)):
+            self.player.apply_powerup(powerup.powerup_type)
+            self.despawn_powerup(powerup)
+            self.events.append((SimulationEvent.POWERUP_COLLECTED, powerup.powerup_type))
+
+        self.score, enemies_hit = check_enemy_explosions(self.enemies, self.explosions, self.score)
+        if enemies_hit:
+            self.events.append((SimulationEvent.ENEMY_HIT, enemies_hit))
+
+    def is_cleared(self):
+        """Returns True when there are no destructible blocks left"""
+        return count_destructible_blocks(self.game_map) == 0
+
+    def clear(self):
+        """Removes all entities, bombs and powerups go back to the pools"""
+        for bomb in list(self.bombs):
+            if bomb.fuse is not None:
+                bomb.fuse.cancel()
+            bomb.kill()
+            self.pools.bombs.release(bomb)
+        for powerup in list(self.powerups):
+            self.despawn_powerup(powerup)
+        for group in (self.all_sprites, self.players, self.enemies, self.bombs, self.powerups):
+            group.empty()
+        self.explosions.clear()
+        self.ai_scheduler.clear()
+        self.detonating = []
+        self.events = []
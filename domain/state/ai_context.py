@@ -0,0 +1,88 @@
+from utils.blast_reach import BlastReach
+from utils.connectivity import ConnectivityIndex
+from utils.danger_map import DangerMap
+from utils.distance_field import DistanceField
+from utils.dstar_lite import DStarLite
+from utils.enemy_coordinator import EnemyCoordinator
+from utils.hpa_star import HierarchicalPathfinder
+from utils.path_cache import PathCache
+
+
+class AIContext:
+    """
+    Class holding structures shared by all enemies on one game map
+
+    map indices (blast reach, distance field, connectivity, HPA*) are map observers fed from the map journal
+    by sync_map - a tile that became empty is passed to on_brick_destroyed, any other change (or changes
+    that left the journal before they were seen) rebuilds them. The path cache and the coordinator check
+    the map version themselves. Danger map and tile costs are rebuilt once per tick by update.
+    Enemies read all of it, none of it is built per enemy.
+    """
+    INCREMENTAL_PLANNER_MAX_ENEMIES = 8  # nad tento počet sdílí nepřátelé pole vzdáleností
+    HIERARCHICAL_MIN_TILES = 2500  # od 50x50 políček se hledá hierarchicky (HPA*)
+
+    def __init__(self, game_map):
+        self.game_map = game_map
+        self.distance_field = DistanceField(game_map)
+        self.path_cache = PathCache(game_map)
+        self.connectivity = ConnectivityIndex(game_map)
+        self.blast_reach = BlastReach(game_map)
+        self.danger_map = DangerMap(game_map, self.blast_reach)
+        self.movement_costs = None
+        self.coordinator = EnemyCoordinator(game_map)
+        self.worker_pool = None  # AIWorkerPool, pokud hra počítá rozhodnutí ve worker procesech
+        self.map_observers = [self.blast_reach, self.distance_field, self.connectivity]
+        self.version = game_map.version  # verze mapy, kterou indexy znají
+        self._journal = game_map.dirty  # seznam změn, ze kterého se čte, a kolik z něj už bylo přečteno
+        self._seen = len(game_map.dirty)
+
+        # na velkých mapách by pole vzdáleností i D* Lite procházely celou mapu, místo nich HPA*
+        self.hierarchical = None
+        self.path_finder = self.distance_field.find_path
+        if game_map.size >= self.HIERARCHICAL_MIN_TILES:
+            self.hierarchical = HierarchicalPathfinder(game_map)
+            self.path_finder = self.hierarchical.find_path
+            self.map_observers.append(self.hierarchical)
+
+    def sync_map(self):
+        """Passes map changes made since the last call to the map observers"""
+        game_map = self.game_map
+        if game_map.version == self.version:
+            return
+        journal = game_map.dirty
+        if journal is not self._journal:  # deník se mezitím vyprázdnil (clear_dirty)
+            self._journal = journal
+            self._seen = 0
+        changed = journal[self._seen:]
+        self._seen = len(journal)
+
+        # každá zapsaná změna zvyšuje verzi o jedna, jinak se mapa měnila mimo deník
+        if self.version + len(changed) == game_map.version and all(game_map.is_floor(x, y) for x, y in changed):
+            for x, y in changed:
+                for observer in self.map_observers:
+                    observer.on_brick_destroyed(x, y)
+        else:
+            for observer in self.map_observers:
+                observer.rebuild()
+        self.version = game_map.version
+
+    def update(self, bombs, explosions, enemy_count):
+        """
+        Rebuilds the per-tick structures
+
+        Inputs:
+        -------
+        bombs
+            placed bombs
+        explosions : ExplosionField
+            active explosions
+        enemy_count : int
+            with few enemies each of them keeps its own incremental planner (D* Lite),
+            crowds (and all enemies on large maps) share the path cache instead
+        """
+        self.sync_map()
+        self.danger_map.build(bombs, explosions)
+        if self.hierarchical is None and enemy_count <= self.INCREMENTAL_PLANNER_MAX_ENEMIES:
+            self.movement_costs = DStarLite.build_costs(self.game_map, self.danger_map)
+        else:
+            self.movement_costs = None
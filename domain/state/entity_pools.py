@@ -0,0 +1,25 @@
+from domain.entity.bomb import Bomb
+from domain.entity.explosion import Explosion
+from domain.entity.powerup import PowerUp
+from utils.object_pool import ObjectPool
+
+
+class EntityPools:
+    """
+    Class holding pools of short-lived entities
+
+    the game keeps one instance for the whole session and hands it to the simulation of every level,
+    so bombs, powerups and explosion views survive level changes and are reused instead of reallocated
+    """
+    def __init__(self):
+        self.bombs = ObjectPool(Bomb)
+        self.powerups = ObjectPool(PowerUp)
+        self.explosions = ObjectPool(Explosion)
+
+    def get_stats(self):
+        """Returns occupancy of all pools as a dictionary"""
+        return {
+            'bombs': self.bombs.get_stats(),
+            'powerups': self.powerups.get_stats(),
+            'explosions': self.explosions.get_stats(),
+        }
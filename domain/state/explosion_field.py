@@ -0,0 +1,99 @@
+import numpy as np
+
+from domain.entity.explosion import Explosion
+
+
+class ExplosionField:
+    """
+    Class for active explosions stored in an array over the map
+
+    there is at most one explosion per tile, so explosions are one array of ticks over the map: when the
+    explosion on the tile disappears (its age for the animation follows from it). A whole blast is ignited
+    by one masked assignment, explosions end by themselves when the timer wheel passes their end (no update, no kill)
+    and "is there an explosion" is a comparison of one cell. Explosion objects exist only as views
+    for rendering (views), built for the tiles that are on fire.
+    """
+    DURATION = Explosion.DURATION
+
+    def __init__(self, shape, timers, iso_utils=None, pool=None):
+        """
+        Inputs:
+        -------
+        shape : tuple
+            height and width of the map
+        timers : TimerWheel
+            timer wheel of the simulation, its now is the current tick
+        iso_utils : IsometricUtils, default None
+            used only for sprites of the views, None for headless simulation
+        pool : ObjectPool, default None
+            pool the views are taken from and returned to when their tile stops burning
+        """
+        self.timers = timers
+        self.iso_utils = iso_utils
+        self.ends = np.zeros(shape, dtype=np.int64)  # tick, kdy exploze zmizí - ends <= now znamená žádná
+        self._views = {}  # (x, y) -> Explosion pro vykreslení
+        self.pool = pool
+
+    def ignite(self, blast):
+        """
+        Sets the tiles on fire, an explosion already burning on a tile starts again
+
+        Inputs:
+        -------
+        blast : 2d bool array
+            tiles reached by the blast
+        """
+        now = self.timers.now
+        # aktuální tick se počítá do doby trvání
+        self.ends[blast] = now + self.DURATION - 1
+
+    def active(self):
+        """Returns bool mask of the tiles with an explosion"""
+        return self.ends > self.timers.now
+
+    def has(self, x, y):
+        """Returns True if there is an explosion on the tile"""
+        return self.ends[y, x] > self.timers.now
+
+    def remaining(self, x, y):
+        """Returns ticks until the explosion on the tile disappears, 0 when there is none"""
+        return max(0, int(self.ends[y, x]) - self.timers.now)
+
+    def __len__(self):
+        return int(np.count_nonzero(self.active()))
+
+    def views(self):
+        """
+        Returns Explosion views of the burning tiles for rendering, views are kept while the tile burns
+
+        Returns:
+        --------
+            list of Explosion with timer set to the remaining ticks
+        """
+        views = {}
+        for y, x in np.argwhere(self.active()).tolist():
+            view = self._views.pop((x, y), None)
+            if view is None:
+                view = self._new_view(x, y)
+            view.timer = self.remaining(x, y)
+            views[(x, y)] = view
+        # zbylé pohledy patří políčkům, která už nehoří
+        self._release_views()
+        self._views = views
+        return list(views.values())
+
+    def _new_view(self, x, y):
+        if self.pool is not None:
+            return self.pool.acquire(x, y, self.iso_utils)
+        return Explosion(x, y, self.iso_utils)
+
+    def _release_views(self):
+        if self.pool is not None:
+            for view in self._views.values():
+                self.pool.release(view)
+        self._views = {}
+
+    def clear(self):
+        """Removes all explosions"""
+        self.ends.fill(0)
+        self._release_views()
@@ -0,0 +1,134 @@
+from numbers import Integral
+
+import numpy as np
+
+
+class GameMap:
+    """
+    Class for the game map grid
+
+    cells are stored once as bytes (uint8, 0 = floor, 1 = wall, 2 = brick) and exposed two ways:
+    flat is a bytearray indexed y * width + x for fast scalar reads from Python,
+    array is a zero-copy 2d NumPy view of the same memory for bulk operations (np.asarray(game_map) returns it).
+    Indexing (game_map[y, x], slices, masks, index arrays) and comparisons (game_map == 2 is a mask) work like
+    on the raw array, so the map can be passed wherever the array was.
+
+    Changes are journaled: version grows with every change, brick_count is the number of bricks left
+    and dirty lists cells (x, y) changed since clear_dirty (the simulation clears it at the start of each tick).
+    Writes must go through game_map[y, x] = value, writing to flat or array directly bypasses the journal.
+    Writes of whole slices (map generation) bump the version and recount bricks, they are not listed in dirty.
+    """
+    FLOOR = 0
+    WALL = 1
+    BRICK = 2
+
+    def __init__(self, width, height):
+        """
+        Inputs:
+        -------
+        width : int
+            number of columns
+        height : int
+            number of rows
+        """
+        self.width = width
+        self.height = height
+        self.shape = (height, width)
+        self.size = width * height
+        self.flat = bytearray(self.size)
+        self.array = np.frombuffer(self.flat, dtype=np.uint8).reshape(self.shape)
+        self.version = 0
+        self.brick_count = 0
+        self.dirty = []
+
+    def __array__(self, dtype=None, copy=None):
+        convert = dtype is not None and dtype != self.array.dtype
+        if convert and copy is False:
+            raise ValueError('GameMap cannot be converted to %s without a copy' % np.dtype(dtype))
+        if convert:
+            return self.array.astype(dtype)
+        if copy:
+            # kopie je snímek mapy, zápisy do ní se nedostanou do deníku
+            return self.array.copy()
+        return self.array
+
+    def _cell(self, key):
+        """Returns flat index for a key of two integers inside the map (negative count from the end), else None"""
+        if type(key) is not tuple or len(key) != 2:
+            return None
+        y, x = key
+        if not (isinstance(y, Integral) and isinstance(x, Integral)):
+            return None
+        if isinstance(y, bool) or isinstance(x, bool):  # bool je také Integral, ale NumPy ho bere jako masku
+            return None
+        y = int(y) + self.height if y < 0 else int(y)
+        x = int(x) + self.width if x < 0 else int(x)
+        if 0 <= y < self.height and 0 <= x < self.width:
+            return y * self.width + x
+        return None
+
+    def __getitem__(self, key):
+        index = self._cell(key)
+        if index is not None:
+            return self.flat[index]
+        # řezy, masky a pole indexů řeší NumPy
+        return self.array[key]
+
+    def __setitem__(self, key, value):
+        index = self._cell(key)
+        if index is not None:
+            self.set(index % self.width, index // self.width, value)
+            return
+        self.array[key] = value
+        self.version += 1
+        self.brick_count = int(np.count_nonzero(self.array == self.BRICK))
+
+    # porovnání vrací masky jako na poli (game_map == 2)
+    def __eq__(self, other):
+        return self.array == other
+
+    def __ne__(self, other):
+        return self.array != other
+
+    def __lt__(self, other):
+        return self.array < other
+
+    def __le__(self, other):
+        return self.array <= other
+
+    def __gt__(self, other):
+        return self.array > other
+
+    def __ge__(self, other):
+        return self.array >= other
+
+    __hash__ = object.__hash__  # mapa zůstává klíčem podle identity (StaticLayer, cache)
+
+    def __len__(self):
+        return self.height
+
+    def get(self, x, y):
+        """Returns the cell value, x and y must be inside the map"""
+        return self.flat[y * self.width + x]
+
+    def set(self, x, y, value):
+        """Changes the cell and records the change in the journal"""
+        index = y * self.width + x
+        value = int(value)
+        old = self.flat[index]
+        if old == value:
+            return
+        self.flat[index] = value
+        self.brick_count += (value == self.BRICK) - (old == self.BRICK)
+        self.version += 1
+        self.dirty.append((x, y))
+
+    def clear_dirty(self):
+        """Returns the cells changed since the last call and starts a new list"""
+        dirty = self.dirty
+        self.dirty = []
+        return dirty
+
+    def is_floor(self, x, y):
+        """Returns True if the tile is inside the map and empty"""
+        return 0 <= x < self.width and 0 <= y < self.height and self.flat[y * self.width + x] == 0
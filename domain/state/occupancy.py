@@ -0,0 +1,53 @@
+import pygame
+
+
+class TileGroup(pygame.sprite.Group):
+    """
+    Class for sprite group indexed by tile (occupancy index)
+
+    keeps a dictionary tile -> sprites up to date as sprites are added, killed or relocated,
+    so "what is on this tile" is answered in constant time instead of scanning the whole group.
+    Sprites that move must be relocated by whoever moves them (see relocate).
+    """
+    _EMPTY = frozenset()
+
+    def __init__(self, *sprites):
+        self.tiles = {}         # (x, y) -> set sprajtů na políčku
+        self.sprite_tiles = {}  # sprite -> políčko, pod kterým je zaindexovaný
+        super().__init__(*sprites)
+
+    def add_internal(self, sprite, layer=None):
+        super().add_internal(sprite, layer)
+        tile = (sprite.grid_x, sprite.grid_y)
+        self.sprite_tiles[sprite] = tile
+        self.tiles.setdefault(tile, set()).add(sprite)
+
+    def remove_internal(self, sprite):
+        super().remove_internal(sprite)
+        tile = self.sprite_tiles.pop(sprite, None)
+        if tile is not None:
+            self._discard(tile, sprite)
+
+    def _discard(self, tile, sprite):
+        sprites = self.tiles[tile]
+        sprites.discard(sprite)
+        if not sprites:
+            del self.tiles[tile]
+
+    def relocate(self, sprite):
+        """Moves the sprite in the index to its current grid position"""
+        old_tile = self.sprite_tiles.get(sprite)
+        new_tile = (sprite.grid_x, sprite.grid_y)
+        if old_tile is None or old_tile == new_tile:
+            return
+        self._discard(old_tile, sprite)
+        self.sprite_tiles[sprite] = new_tile
+        self.tiles.setdefault(new_tile, set()).add(sprite)
+
+    def at(self, x, y):
+        """Returns sprites on the tile (do not modify the returned set)"""
+        return self.tiles.get((x, y), self._EMPTY)
+
+    def has(self, x, y):
+        """Returns True if there is any sprite of the group on the tile"""
+        return (x, y) in self.tiles
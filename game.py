@@ -3,15 +3,18 @@ import time
 import math
 import random
 
-from domain.entity.bomb import Bomb
 from domain.entity.enemy import Enemy
 from domain.entity.player import Player
 from ui_components import GameState, Button
 from utils.isometric_utils import IsometricUtils
-from game_logic import (create_game_map, create_isometric_sprites, create_sounds, create_isometric_background, 
-                       explode_bomb, check_collisions, check_enemy_explosions, count_destructible_blocks,
-                       create_story_map, STORY_TOTAL_LEVELS)
+from game_logic import (create_game_map, create_isometric_sprites, create_sounds, create_isometric_background,
+                        create_brick_particles, create_story_map, STORY_TOTAL_LEVELS)
 from domain.entity.biome import Biome
+from domain.simulation import GameSimulation, SimulationEvent
+from domain.state.entity_pools import EntityPools
+from utils.ai_workers import AIWorkerPool
+from utils.depth_renderer import DepthRenderer
+from utils.static_layer import StaticLayer
 
 class BoomerManGame:
     """
@@ -25,7 +28,16 @@ class BoomerManGame:
         pygame.init()
         self.WIDTH = 1000
         self.HEIGHT = 700
-        self.FPS = 15
+        self.FPS = 15  # logické ticky za sekundu - všechny časovače (bomby, exploze, imunita) počítají ticky
+        self.RENDER_FPS = 60  # strop vykreslování, 0 = kreslí se tak rychle, jak displej stíhá
+        self.MAX_TICKS_PER_FRAME = 5  # po záseku se nedohání víc ticků najednou
+        self.DIRTY_RECTS = True  # ve hře se obnovují jen změněné oblasti obrazovky, při otřesu celá
+        self.tick_alpha = 1.0  # jak daleko mezi posledním a příštím tickem se kreslí
+        self.sprites_tick = None  # tick, pro který jsou sprity entit sestavené
+        self.AI_BUDGET_MS = 4.0  # kolik ms za snímek smí nepřátelé přemýšlet
+        self.USE_AI_WORKERS = False  # volitelný backend s worker procesy pro velké počty nepřátel
+        self.AI_WORKERS_MIN_ENEMIES = 64
+        self.ai_workers = None
         
         self.screen = pygame.display.set_mode((self.WIDTH, self.HEIGHT))
         pygame.display.set_caption("Boomer Man - Isometric 3D")
@@ -35,6 +47,12 @@ class BoomerManGame:
         self.iso_utils = IsometricUtils(tile_width=64, tile_height=32)
         self.camera_offset_x = self.WIDTH // 2
         self.camera_offset_y = 100
+        # předkreslené pozadí, podlaha a zdi
+        self.static_layer = StaticLayer((self.WIDTH, self.HEIGHT), self.iso_utils,
+                                        (self.camera_offset_x, self.camera_offset_y))
+        self.previous_dirty = None  # oblasti nakreslené minulým snímkem hry
+        self.previous_layer_state = None
+        self.depth_renderer = DepthRenderer()
         
         self.game_state = GameState.INTRO
         self.menu_screen_clicked = False
@@ -55,13 +73,10 @@ class BoomerManGame:
         self.running = True
         self.keys_pressed = set()
         
-        # Sprite groups
-        self.all_sprites = pygame.sprite.Group()
-        self.players = pygame.sprite.Group()
-        self.enemies = pygame.sprite.Group()
-        self.bombs = pygame.sprite.Group()
-        self.explosions = pygame.sprite.Group()
-        self.powerups = pygame.sprite.Group()
+        # Herní pravidla a entity drží simulace (GameSimulation), hra ji řídí a vykresluje
+        self.simulation = None
+        # bomby, powerupy a pohledy explozí se recyklují napříč levely
+        self.entity_pools = EntityPools()
         
         # UI tlačítka pro menu
         self.play_button = Button(self.WIDTH//2 - 100, self.HEIGHT//2 - 30, 200, 50,
@@ -96,23 +111,19 @@ class BoomerManGame:
         self.grid_height = 11
         
         # Vytvoření herního pole
-        self.game_map = create_game_map(self.grid_width, self.grid_height)
+        game_map = create_game_map(self.grid_width, self.grid_height)
         
         # Vytvoření hráče a nepřátel jako sprite objekty
-        self.player = Player(1, 1, self.iso_utils)
+        player = Player(1, 1, self.iso_utils)
         # Nastaví 3 bomby pro normální high-score mód
-        self.player.max_bombs = 3
-        self.all_sprites.add(self.player)
-        self.players.add(self.player)
+        player.max_bombs = 3
         
         # Nepřátelé - 3 v rozích pro normální mód
         enemy_positions = [(self.grid_width-2, self.grid_height-2),
                           (self.grid_width-2, 2), (2, self.grid_height-2)]
-        
-        for x, y in enemy_positions:
-            enemy = Enemy(x, y, self.iso_utils)
-            self.all_sprites.add(enemy)
-            self.enemies.add(enemy)
+        enemies = [Enemy(x, y, self.iso_utils) for x, y in enemy_positions]
+        self.simulation = GameSimulation(game_map, player, enemies, self.lives, self.score,
+                                         self.iso_utils, self.AI_BUDGET_MS, self.entity_pools)
         
         # Animace a efekty
         self.bomb_pulse_timer = 0
@@ -189,136 +200,95 @@ class BoomerManGame:
                 self.game_state = GameState.MENU_SCREEN
         
         elif self.game_state == GameState.PLAYING or self.game_state == GameState.STORY_PLAYING:
-            self.update_player()
-            self.update_sprites()
-            self.check_game_collisions()
+            self.update_ai_workers()
+            events = self.simulation.step(self.get_player_direction())
+            self.static_layer.mark_dirty(self.simulation.game_map.dirty)
+            self.score = self.simulation.score
+            self.lives = self.simulation.lives
+            self.handle_simulation_events(events)
+            self.check_game_state()
+            self.update_particles()
+            # Snížení screen shake
+            if self.screen_shake > 0:
+                self.screen_shake -= 1
     
-    def update_player(self):
+    def get_player_direction(self):
         """
-        Processes the movements of the player.
+        Translates pressed keys to the direction of the player move, None if no move key is pressed.
         """
-        moving = False
-        
-        # Update hráče (pro imunitu)
-        self.player.update()
-        
         if pygame.K_LEFT in self.keys_pressed or pygame.K_a in self.keys_pressed:
-            if self.player.move(-1, 0, self.game_map, self.grid_width, self.grid_height, self.bombs):
-                moving = True
-                self.player.set_facing_direction(-1)
+            return -1, 0
         elif pygame.K_RIGHT in self.keys_pressed or pygame.K_d in self.keys_pressed:
-            if self.player.move(1, 0, self.game_map, self.grid_width, self.grid_height, self.bombs):
-                moving = True
-                self.player.set_facing_direction(1)
+            return 1, 0
         elif pygame.K_UP in self.keys_pressed or pygame.K_w in self.keys_pressed:
-            if self.player.move(0, -1, self.game_map, self.grid_width, self.grid_height, self.bombs):
-                moving = True
+            return 0, -1
         elif pygame.K_DOWN in self.keys_pressed or pygame.K_s in self.keys_pressed:
-            if self.player.move(0, 1, self.game_map, self.grid_width, self.grid_height, self.bombs):
-                moving = True
-        
-        self.player.animate(moving)
+            return 0, 1
+        return None
     
     def place_bomb(self):
         """
         Processe the bomb placement.
-        Checks whether the player can place another bomb.
-        Creates new sprite for the bomb.
+        The simulation checks whether the player can place another bomb and reports the placed bomb as an event.
         """
-        # Zkontroluj, jestli hráč může položit bombu (limit podle levelu)
-        if not self.player.can_place_bomb():
-            return
-
-        bomb_pos = (self.player.grid_x, self.player.grid_y)
-        # Zkontroluj, jestli na pozici už není bomba
-        bomb_exists = any(bomb.grid_x == bomb_pos[0] and bomb.grid_y == bomb_pos[1] 
-                         for bomb in self.bombs)
-        
-        if not bomb_exists:
-            # Použij sílu bomb z hráče (může být zvýšená powerupem)
-            bomb_power = self.player.get_bomb_power()
-            bomb = Bomb(bomb_pos[0], bomb_pos[1], self.iso_utils, power=bomb_power)
-            self.bombs.add(bomb)
-            self.all_sprites.add(bomb)
-            # Přidej bombu do počítadla hráče
-            self.player.add_bomb()
-            # Nastav pozici bomby pro bomb passing mechanismus
-            self.player.set_bomb_placed_position(bomb_pos[0], bomb_pos[1])
-            # Mock zvukový efekt
-            self.sound_effects['bomb_place']['active'] = True
-            self.sound_effects['bomb_place']['timer'] = 20
-            self.sounds['bomb_place'].play()
+        self.simulation.place_bomb()
     
-    def update_sprites(self):
+    def handle_simulation_events(self, events):
         """
-        Processes the bombs, explosions and enemies sprites.
-        Processes whether the bomb should explode and removes the bomb sprite and adds the corresponding explosion sprites.
-        Procecces the explosions and removes them when they should be removed.
-        Processes the enemies and their moves.
+        Plays sounds and visual effects for the events reported by the simulation in the last tick.
         """
-        # Update bomb sprites
-        for bomb in self.bombs.copy():
-            if bomb.update():  # Vrací True pokud má explodovat
-                particles, score_gain, spawned_powerups = explode_bomb(bomb, self.game_map, self.grid_width, 
-                                                   self.grid_height, self.iso_utils, 
-                                                   self.explosions, self.all_sprites, self.powerups)
-                self.explosion_particles.extend(particles)
-                self.score += score_gain
+        for event, data in events:
+            if event == SimulationEvent.BOMB_PLACED:
+                # Mock zvukový efekt
+                self.sound_effects['bomb_place']['active'] = True
+                self.sound_effects['bomb_place']['timer'] = 20
+                self.sounds['bomb_place'].play()
+            elif event == SimulationEvent.EXPLOSION:
+                self.explosion_particles.extend(create_brick_particles(self.iso_utils, data))
                 self.screen_shake = 8
                 self.sound_effects['explosion']['active'] = True
                 self.sound_effects['explosion']['timer'] = 30
                 self.sounds['explosion'].play()
-                # Sníž počítadlo bomb u hráče po explozi
-                self.player.remove_bomb()
-                bomb.kill()
-        
-        # Update explosion sprites
-        for explosion in self.explosions.copy():
-            if explosion.update():  # Vrací True pokud má zmizet
-                explosion.kill()
-        
-        # Update powerup sprites
-        for powerup in self.powerups.copy():
-            if powerup.update():  # Vrací True pokud má zmizet
-                powerup.kill()
-        
-        # Update enemy sprites
-        for enemy in self.enemies:
-            enemy.update(self.game_map, self.grid_width, self.grid_height, self.player, pygame.sprite.Group(self.bombs, self.explosions))
+            elif event == SimulationEvent.PLAYER_HIT:
+                self.sound_effects['player_hit']['active'] = True
+                self.sound_effects['player_hit']['timer'] = 20
+                self.sounds['player_hit'].play()
+            elif event == SimulationEvent.POWERUP_COLLECTED:
+                # Zvukový efekt pro powerup (můžeme použít bomb_place sound)
+                self.sounds['bomb_place'].play()
+            elif event == SimulationEvent.ENEMY_HIT:
+                self.sound_effects['enemy_hit']['active'] = True
+                self.sound_effects['enemy_hit']['timer'] = 20
+                self.sounds['enemy_hit'].play()
     
-    def check_game_collisions(self):
+    def update_ai_workers(self):
+        """
+        Drives the optional process-pool AI backend.
+        Finished results are taken over and a new batch is published only when the previous one is done,
+        enemies meanwhile apply their previous decisions.
+        """
+        simulation = self.simulation
+        if not self.USE_AI_WORKERS or len(simulation.enemies) < self.AI_WORKERS_MIN_ENEMIES:
+            simulation.ai.worker_pool = None
+            return
+
+        if self.ai_workers is None:
+            self.ai_workers = AIWorkerPool()
+        if self.ai_workers.collect():
+            self.ai_workers.publish(simulation.ai, simulation.player, simulation.enemies)
+        simulation.ai.worker_pool = self.ai_workers
+
+    def check_game_state(self):
         """
-        Processes collisions.
-        If the player is hit by explosion or by the enemy he loses a live.
+        Processes the result of the last tick.
         If the player has 0 lives, the game and, player lost.
         If there are no destroyable blocks, player won.
         """
-        # Kolize hráče
-        self.lives, player_hit = check_collisions(self.player, self.enemies, 
-                                                 self.explosions, self.lives, self.score)
-        if player_hit:
-            self.sound_effects['player_hit']['active'] = True
-            self.sound_effects['player_hit']['timer'] = 20
-            self.sounds['player_hit'].play()
-            if self.lives <= 0:
-                self.game_state = GameState.GAME_OVER
-        
-        # Sbírání powerupů
-        collected_powerups = pygame.sprite.spritecollide(self.player, self.powerups, True)
-        for powerup in collected_powerups:
-            self.player.apply_powerup(powerup.powerup_type)
-            # Zvukový efekt pro powerup (můžeme použít bomb_place sound)
-            self.sounds['bomb_place'].play()
-        
-        # Kolize nepřátel s explozemi
-        self.score, enemies_hit = check_enemy_explosions(self.enemies, self.explosions, self.score)
-        if enemies_hit:
-            self.sound_effects['enemy_hit']['active'] = True
-            self.sound_effects['enemy_hit']['timer'] = 20
-            self.sounds['enemy_hit'].play()
+        if self.lives <= 0:
+            self.game_state = GameState.GAME_OVER
         
         # Kontrola vítězství - žádné zničitelné bloky
-        if count_destructible_blocks(self.game_map) == 0:
+        if self.simulation.is_cleared():
             if self.game_state == GameState.STORY_PLAYING:
                 # Story mode - pokračuj na další level nebo ukonči
                 self.story_level += 1
@@ -340,9 +310,8 @@ class BoomerManGame:
                     self.save_high_score()
                 self.game_state = GameState.VICTORY
     
-    def update_explosions(self):
-        """Explosion animation"""
-        # Update částic
+    def update_particles(self):
+        """Moves explosion particles by one tick"""
         for particle in self.explosion_particles[:]:
             particle['x'] += particle['vx']
             particle['y'] += particle['vy']
@@ -350,18 +319,31 @@ class BoomerManGame:
             particle['life'] -= 1
             if particle['life'] <= 0:
                 self.explosion_particles.remove(particle)
-        
-        # Kreslení částic
+    
+    def draw_particles(self):
+        """Explosion animation, returns the drawn areas"""
+        drawn = []
         for particle in self.explosion_particles:
             alpha = max(0, particle['life'] * 8)
             if alpha > 0:
                 color = (*particle['color'], min(255, alpha))
                 size = max(1, particle['life'] // 10)
-                pygame.draw.circle(self.screen, color[:3], (int(particle['x']), int(particle['y'])), size)
+                drawn.append(pygame.draw.circle(self.screen, color[:3], (int(particle['x']), int(particle['y'])), size))
+        return drawn
     
     def draw(self):
         """Function drawing screen content according to the state of the game (level, wellcome screen, gamover etc.)"""
+        if self.game_state == GameState.PLAYING or self.game_state == GameState.STORY_PLAYING:
+            # ve hře se obnovují jen změněné oblasti
+            changed = self.draw_game()
+            if changed is None:
+                pygame.display.flip()
+            else:
+                pygame.display.update(changed)
+            return
+
         self.screen.fill((0, 0, 0))
+        self.previous_dirty = None  # obrazovka už neobsahuje poslední snímek hry
         
         if self.game_state == GameState.INTRO:
             self.draw_intro()
@@ -369,8 +351,6 @@ class BoomerManGame:
             self.draw_menu_screen()
         elif self.game_state == GameState.MENU:
             self.draw_menu()
-        elif self.game_state == GameState.PLAYING or self.game_state == GameState.STORY_PLAYING:
-            self.draw_game()
         elif self.game_state == GameState.GAME_OVER:
             self.draw_game_over()
         elif self.game_state == GameState.VICTORY:
@@ -485,124 +465,128 @@ class BoomerManGame:
             y_offset += 22
     
     def draw_game(self):
-        """Draws current level with its items."""
+        """
+        Draws current level with its items.
+
+        In dirty rect mode only the areas drawn in the previous frame are restored from the static layer
+        and everything is drawn again over them. Returns the changed areas for pygame.display.update,
+        None when the whole screen was redrawn (screen shake, changed board, first frame) and must be flipped.
+        """
         # Screen shake efekt
         shake_x = random.randint(-self.screen_shake, self.screen_shake) if self.screen_shake > 0 else 0
         shake_y = random.randint(-self.screen_shake, self.screen_shake) if self.screen_shake > 0 else 0
         
         self.change_used_sprites()
-
-        # Isometrické pozadí
-        self.screen.blit(self.bg_surface, (shake_x, shake_y))
-        
-        # Render floor tiles and walls in isometric view
-        render_list = []
-        
-        # Collect all tiles and objects for proper depth sorting
-        for y in range(self.grid_height):
-            for x in range(self.grid_width):
-                screen_x, screen_y = self.iso_utils.grid_to_screen(x, y)
-                screen_x += self.camera_offset_x + shake_x
-                screen_y += self.camera_offset_y + shake_y
-                
-                # Floor tile (always render)
-                if self.game_map[y, x] == 0:
-                    floor_rect = self.sprites['floor'].get_rect()
-                    floor_rect.centerx = screen_x + self.iso_utils.half_tile_width
-                    floor_rect.bottom = screen_y + self.iso_utils.tile_height + 40
-                    render_list.append((y + x, 'floor', floor_rect))
-                
-                # Walls and destructible blocks
-                if self.game_map[y, x] == 1:  # Stěna
-                    wall_rect = self.sprites['wall'].get_rect()
-                    wall_rect.centerx = screen_x + self.iso_utils.half_tile_width
-                    wall_rect.bottom = screen_y + self.iso_utils.tile_height + 24
-                    render_list.append((y + x, 'wall', wall_rect))
-                elif self.game_map[y, x] == 2:  # Zničitelná stěna
-                    brick_rect = self.sprites['brick'].get_rect()
-                    brick_rect.centerx = screen_x + self.iso_utils.half_tile_width
-                    brick_rect.bottom = screen_y + self.iso_utils.tile_height + 32
-                    render_list.append((y + x, 'brick', brick_rect))
-        
-        # Add sprites to render list with proper sorting
-        all_entities = list(self.all_sprites)
-        sorted_entities = self.iso_utils.get_render_order(all_entities)
-        
-        for sprite in sorted_entities:
-            adjusted_rect = sprite.rect.copy()
-            adjusted_rect.x += self.camera_offset_x + shake_x
-            adjusted_rect.y += self.camera_offset_y + shake_y
-            render_depth = sprite.grid_y + sprite.grid_x + 0.5  # Slightly higher than tiles
-            render_list.append((render_depth, 'sprite', sprite, adjusted_rect))
-        
-        # Sort and render everything
-        render_list.sort(key=lambda item: item[0])
-        
-        for item in render_list:
-            if item[1] == 'sprite':
-                sprite, rect = item[2], item[3]
-                self.screen.blit(sprite.image, rect)
-            else:
-                sprite_type, rect = item[1], item[2]
-                self.screen.blit(self.sprites[sprite_type], rect)
+        simulation = self.simulation
+        game_map = simulation.game_map
+        player = simulation.player
+
+        # Isometrické pozadí s podlahou a zdmi je předkreslené, při otřesu se jen posune
+        self.static_layer.refresh(game_map, self.sprites, self.bg_surface)
+        # nová mapa vždy znamená přestavbu vrstvy, stačí tedy počet přestaveb a verze
+        layer_state = (self.static_layer.rebuilds, self.static_layer.version)
+        partial = (self.DIRTY_RECTS and self.screen_shake == 0 and self.previous_dirty is not None
+                   and layer_state == self.previous_layer_state)
+        if partial:
+            # smaže se jen to, co bylo nakresleno minule
+            for rect in self.previous_dirty:
+                self.screen.blit(self.static_layer.surface, rect, rect)
+        else:
+            self.screen.fill((0, 0, 0))
+            self.screen.blit(self.static_layer.surface, (shake_x, shake_y))
+        dirty = []
+        
+        # Entities and the tiles in front of them, in depth buckets (painter's algorithm)
+        renderer = self.depth_renderer
+        renderer.begin(self.grid_width + self.grid_height - 1)
+        
+        # Sprity entit se obnovují jen při vykreslení a jen jednou za tick, simulace je nestaví
+        # Exploze jsou v simulaci jen pole, kreslí se přes jejich pohledy
+        all_entities = list(simulation.all_sprites) + simulation.explosions.views()
+        if self.sprites_tick != (simulation, simulation.tick_count):
+            self.sprites_tick = (simulation, simulation.tick_count)
+            for sprite in all_entities:
+                sprite.create_sprite()
+        else:
+            for sprite in all_entities:
+                if sprite.image is None:
+                    sprite.create_sprite()
+        # Pohyblivé entity se kreslí mezi předchozím a aktuálním políčkem
+        for sprite in simulation.players:
+            sprite.update_position(self.tick_alpha)
+        for sprite in simulation.enemies:
+            sprite.update_position(self.tick_alpha)
+        
+        for sprite in all_entities:
+            adjusted_rect = sprite.rect.move(self.camera_offset_x + shake_x, self.camera_offset_y + shake_y)
+            depth = sprite.grid_y + sprite.grid_x
+            renderer.add_sprite(depth, (sprite.image, adjusted_rect))
+            # políčka před entitou se přes ni nakreslí znovu, jen v jejím obdélníku
+            layer_rect = adjusted_rect.move(-shake_x, -shake_y)
+            for tile_depth, sprite_type, tile_rect in self.static_layer.occluders(layer_rect, depth):
+                clip = tile_rect.clip(layer_rect)
+                renderer.add_tile(tile_depth, (self.sprites[sprite_type], clip.move(shake_x, shake_y),
+                                               clip.move(-tile_rect.x, -tile_rect.y)))
+        
+        dirty.extend(renderer.draw(self.screen))
         
         # Kreslení částic
-        self.update_explosions()
+        dirty.extend(self.draw_particles())
         
         # Fancy UI s pozadím - větší pro immunity bar
-        ui_height = 125 if self.player.immunity_timer > 0 else 90
+        ui_height = 125 if player.immunity_timer > 0 else 90
         ui_bg = pygame.Surface((200, ui_height), pygame.SRCALPHA)
         ui_bg.fill((0, 0, 0, 150))
         pygame.draw.rect(ui_bg, (100, 100, 100), (0, 0, 200, ui_height), 2)
-        self.screen.blit(ui_bg, (10, 10))
+        dirty.append(self.screen.blit(ui_bg, (10, 10)))
         
         score_text = self.font.render(f"Skóre: {self.score}", True, (255, 255, 0))
-        self.screen.blit(score_text, (20, 20))
+        dirty.append(self.screen.blit(score_text, (20, 20)))
         
         lives_text = self.font.render(f"Životy: {self.lives}", True, (255, 100, 100))
-        self.screen.blit(lives_text, (20, 50))
+        dirty.append(self.screen.blit(lives_text, (20, 50)))
         
         # Zobraz počítadlo bomb pro všechny módy
-        if self.player.unlimited_bombs_timer > 0:
-            bombs_text = self.font.render(f"Bomby: ∞ ({self.player.unlimited_bombs_timer // 15 + 1}s)", True, (255, 255, 0))
+        if player.unlimited_bombs_timer > 0:
+            bombs_text = self.font.render(f"Bomby: ∞ ({player.unlimited_bombs_timer // 15 + 1}s)", True, (255, 255, 0))
         else:
-            bombs_text = self.font.render(f"Bomby: {self.player.current_bomb_count}/{self.player.max_bombs}", True, (255, 200, 100))
-        self.screen.blit(bombs_text, (220, 20))
+            bombs_text = self.font.render(f"Bomby: {player.current_bomb_count}/{player.max_bombs}", True, (255, 200, 100))
+        dirty.append(self.screen.blit(bombs_text, (220, 20)))
         
         # Zobraz aktivní powerupy pro všechny módy
         powerup_y = 50
         if self.game_state == GameState.STORY_PLAYING:
             level_text = self.font.render(f"Level: {self.story_level}/{STORY_TOTAL_LEVELS}", True, (255, 255, 255))
-            self.screen.blit(level_text, (220, powerup_y))
+            dirty.append(self.screen.blit(level_text, (220, powerup_y)))
             powerup_y += 30
         
-        if self.player.speed_boost_timer > 0:
-            speed_text = self.font.render(f"⚡ Rychlost ({self.player.speed_boost_timer // 15 + 1}s)", True, (100, 255, 100))
-            self.screen.blit(speed_text, (220, powerup_y))
+        if player.speed_boost_timer > 0:
+            speed_text = self.font.render(f"⚡ Rychlost ({player.speed_boost_timer // 15 + 1}s)", True, (100, 255, 100))
+            dirty.append(self.screen.blit(speed_text, (220, powerup_y)))
             powerup_y += 25
-        if self.player.bigger_explosion_timer > 0:
-            explosion_text = self.font.render(f"💥 Velká exploze ({self.player.bigger_explosion_timer // 15 + 1}s)", True, (255, 100, 255))
-            self.screen.blit(explosion_text, (220, powerup_y))
+        if player.bigger_explosion_timer > 0:
+            explosion_text = self.font.render(f"💥 Velká exploze ({player.bigger_explosion_timer // 15 + 1}s)", True, (255, 100, 255))
+            dirty.append(self.screen.blit(explosion_text, (220, powerup_y)))
 
         # Progress bar pro bomby
-        if len(self.bombs) > 0:
-            bomb_timer = min(bomb.timer for bomb in self.bombs)
+        if len(simulation.bombs) > 0:
+            bomb_timer = min(bomb.timer for bomb in simulation.bombs)
             progress = bomb_timer / 75.0
-            pygame.draw.rect(self.screen, (100, 0, 0), (20, 75, 160, 10))
-            pygame.draw.rect(self.screen, (255, 0, 0), (20, 75, int(160 * progress), 10))
+            dirty.append(pygame.draw.rect(self.screen, (100, 0, 0), (20, 75, 160, 10)))
+            dirty.append(pygame.draw.rect(self.screen, (255, 0, 0), (20, 75, int(160 * progress), 10)))
         
         # Progress bar pro imunitu hráče
-        if self.player.immunity_timer > 0:
-            immunity_progress = self.player.immunity_timer / 120.0
-            pygame.draw.rect(self.screen, (0, 0, 100), (20, 90, 160, 10))
-            pygame.draw.rect(self.screen, (0, 150, 255), (20, 90, int(160 * immunity_progress), 10))
+        if player.immunity_timer > 0:
+            immunity_progress = player.immunity_timer / 120.0
+            dirty.append(pygame.draw.rect(self.screen, (0, 0, 100), (20, 90, 160, 10)))
+            dirty.append(pygame.draw.rect(self.screen, (0, 150, 255), (20, 90, int(160 * immunity_progress), 10)))
             
             # Text pro imunitu
             immunity_text = self.font.render("Imunita", True, (0, 150, 255))
-            self.screen.blit(immunity_text, (20, 105))
+            dirty.append(self.screen.blit(immunity_text, (20, 105)))
         
         # Mock vizuální indikace zvukových efektů
-        effect_y = 130 if self.player.immunity_timer > 0 else 95
+        effect_y = 130 if player.immunity_timer > 0 else 95
         for effect_name, effect in self.sound_effects.items():
             if effect['active']:
                 alpha = min(255, effect['timer'] * 12)
@@ -614,12 +598,14 @@ class BoomerManGame:
                 }
                 color = color_map.get(effect_name, (255, 255, 255))
                 text = self.font.render(f"♪ {effect_name}", True, (*color, alpha))
-                self.screen.blit(text, (220, effect_y))
+                dirty.append(self.screen.blit(text, (220, effect_y)))
                 effect_y += 25
-        
-        # Snížení screen shake
-        if self.screen_shake > 0:
-            self.screen_shake -= 1
+
+        changed = self.previous_dirty + dirty if partial else None
+        # po otřesu je posunutá celá obrazovka, další snímek se kreslí celý
+        self.previous_dirty = dirty if self.screen_shake == 0 else None
+        self.previous_layer_state = layer_state
+        return changed
     
     def load_high_score(self):
         """Načte nejlepší skóre ze souboru"""
@@ -655,12 +641,8 @@ class BoomerManGame:
 
     def clear_sprites(self):
         """Vymaže všechny sprite skupiny"""
-        self.all_sprites.empty()
-        self.players.empty()
-        self.enemies.empty()
-        self.bombs.empty()
-        self.explosions.empty()
-        self.powerups.empty()
+        if self.simulation is not None:
+            self.simulation.clear()
         self.explosion_particles = []
         self.screen_shake = 0
 
@@ -679,14 +661,7 @@ class BoomerManGame:
         self.lives = 3
         self.story_level = 1
         self.is_story_mode = True
-        self.all_sprites.empty()
-        self.players.empty()
-        self.enemies.empty()
-        self.bombs.empty()
-        self.explosions.empty()
-        self.powerups.empty()
-        self.explosion_particles = []
-        self.screen_shake = 0
+        self.clear_sprites()
         self.biome = None
         self.init_story_level()
         self.game_state = GameState.STORY_PLAYING
@@ -697,27 +672,22 @@ class BoomerManGame:
         self.grid_height = 11
 
         # Vytvoření story mapy podle levelu
-        self.game_map = create_story_map(self.story_level, self.grid_width, self.grid_height)
+        game_map = create_story_map(self.story_level, self.grid_width, self.grid_height)
 
         # Vytvoření hráče
-        self.player = Player(1, 1, self.iso_utils)
+        player = Player(1, 1, self.iso_utils)
         # Nastaví počet bomb podle levelu + 1 jako default
-        self.player.set_max_bombs_for_level(self.story_level)
-        self.player.max_bombs += 1  # +1 bomba navíc
-        self.all_sprites.add(self.player)
-        self.players.add(self.player)
+        player.set_max_bombs_for_level(self.story_level)
+        player.max_bombs += 1  # +1 bomba navíc
 
         # Nepřátelé - počet se zvyšuje s levelem
         enemy_count = min(3, 1 + (self.story_level - 1) // 2)
         enemy_positions = [(self.grid_width-2, self.grid_height-2),
                           (self.grid_width-2, 2), (2, self.grid_height-2)]
 
-        for i in range(enemy_count):
-            if i < len(enemy_positions):
-                x, y = enemy_positions[i]
-                enemy = Enemy(x, y, self.iso_utils)
-                self.all_sprites.add(enemy)
-                self.enemies.add(enemy)
+        enemies = [Enemy(x, y, self.iso_utils) for x, y in enemy_positions[:enemy_count]]
+        self.simulation = GameSimulation(game_map, player, enemies, self.lives, self.score,
+                                         self.iso_utils, self.AI_BUDGET_MS, self.entity_pools)
 
         # Inicializace efektů
         self.bomb_pulse_timer = 0
@@ -919,14 +889,29 @@ class BoomerManGame:
         Main loop of the game.
 
         1. events are handled.
-        2. all sprites are updated
-        3. screen is redrawn
-        4. fixed FPS
+        2. game logic advances in fixed ticks (FPS per second), as many as the elapsed time requires
+        3. screen is redrawn at display rate (RENDER_FPS), moving entities are interpolated between ticks
         """
+        tick_time = 1.0 / self.FPS
+        accumulator = 0.0
+        self.clock.tick()  # čas strávený inicializací se nedohání
         while self.running:
+            accumulator += self.clock.tick(self.RENDER_FPS) / 1000.0
             self.handle_events()
-            self.update()
+
+            if self.simulation is not None:
+                self.simulation.begin_frame()  # rozpočet AI platí pro všechny ticky snímku
+            ticks = 0
+            while accumulator >= tick_time and ticks < self.MAX_TICKS_PER_FRAME:
+                self.update()
+                accumulator -= tick_time
+                ticks += 1
+            if ticks == self.MAX_TICKS_PER_FRAME:
+                accumulator = min(accumulator, tick_time)  # zbytek po záseku se zahodí
+
+            self.tick_alpha = min(1.0, accumulator / tick_time)
             self.draw()
-            self.clock.tick(self.FPS)
         
+        if self.ai_workers is not None:
+            self.ai_workers.close()
         pygame.quit()
\ No newline at end of file
@@ -2,9 +2,9 @@ import numpy as np
 import pygame
 import random
 import math
-from domain.entity.explosion import Explosion
 from utils.isometric_utils import IsometricUtils
 from domain.entity.biome import Biome
+from domain.state.game_map import GameMap
 
 # Story mode konstanty
 STORY_TOTAL_LEVELS = 5
@@ -12,7 +12,7 @@ STORY_TOTAL_LEVELS = 5
 
 def create_game_map(grid_width, grid_height):
     """Vytvoří herní mapu s stěnami a zničitelnými objekty"""
-    game_map = np.zeros((grid_height, grid_width), dtype=int)
+    game_map = GameMap(grid_width, grid_height)
 
     # 0 = prázdné, 1 = stěna, 2 = zničitelná stěna
     # Okraje jsou stěny
@@ -44,6 +44,8 @@ def create_game_map(grid_width, grid_height):
                 if not is_important and np.random.random() < 0.25:
                     game_map[i, j] = 2
 
+    # vygenerovaná mapa začíná bez změn
+    game_map.clear_dirty()
     return game_map
 
 
@@ -135,116 +137,112 @@ def create_sounds():
         "player_hit": pygame.mixer.Sound("assets/sounds/player_hit.wav"),
     }
 
-def explode_bomb(bomb, game_map, grid_width, grid_height, iso_utils, explosions_group, all_sprites_group, powerups_group=None):
-    """Zpracuje explozi bomby a vytvoří exploze ve všech směrech"""
-    x, y = bomb.grid_x, bomb.grid_y
-    power = bomb.power
-    explosion_particles = []
-    score_gained = 0
+def explode_bombs(blast_resolver, bombs, live_bombs, game_map, iso_utils, explosions, all_sprites_group,
+                  powerups_group=None, powerup_pool=None):
+    """
+    Zpracuje výbuch všech bomb, které vybuchly v jednom ticku, včetně řetězové reakce
+
+    blast_resolver (BlastResolver) spočítá dosah všech bomb najednou nad mapou, live_bombs jsou všechny bomby
+    na mapě - bomby zasažené výbuchem vybuchnou ve stejném ticku. Celý zasažený prostor se zapálí najednou
+    v explosions (ExplosionField), zasažení políčka s běžící explozí ji jen obnoví.
+
+    Nové powerupy se berou z powerup_pool (ObjectPool), pokud je zadaný, jejich zmizení naplánuje volající
+
+    Zničené zdi se zapisují do mapy (deníku změn), indexy nad mapou se podle něj aktualizují samy (AIContext)
+
+    Vrací vybuchlé bomby, seznam zničených zdí (x, y), získané skóre a nové powerupy - částice z nich
+    vytvoří až vykreslování (create_brick_particles)
+    """
+    detonated, blast, bricks, score_gained = blast_resolver.resolve(bombs, live_bombs)
+    destroyed_bricks = []
     spawned_powerups = []
 
-    # Střed exploze
-    explosion = Explosion(x, y, iso_utils)
-    explosions_group.add(explosion)
-    all_sprites_group.add(explosion)
-
-    # Exploze ve všech směrech
-    directions = [(0, 1), (0, -1), (1, 0), (-1, 0)]
-    for dx, dy in directions:
-        for i in range(1, power + 1):
-            nx, ny = x + dx * i, y + dy * i
-            if 0 <= nx < grid_width and 0 <= ny < grid_height:
-                if game_map[ny, nx] == 1:  # Neznič. stěna
-                    break
-                if game_map[ny, nx] == 2:  # Zničitelná stěna
-                    game_map[ny, nx] = 0
-                    score_gained += 10
-                    
-                    # Šance na spawn powerupu (20% chance)
-                    if powerups_group is not None and random.random() < 0.2:
-                        from domain.entity.powerup import PowerUp
-                        powerup = PowerUp(nx, ny, iso_utils)
-                        powerups_group.add(powerup)
-                        all_sprites_group.add(powerup)
-                        spawned_powerups.append(powerup)
-                    
-                    # Isometrické částice při destrukci
-                    screen_x, screen_y = iso_utils.grid_to_screen(nx, ny)
-                    for _ in range(8):
-                        explosion_particles.append({
-                            'x': screen_x + random.randint(-20, 20),
-                            'y': screen_y + random.randint(-20, 20),
-                            'vx': random.uniform(-4, 4),
-                            'vy': random.uniform(-6, 2),
-                            'life': 40,
-                            'color': (139, 69, 19)
-                        })
-                    break
-                explosion = Explosion(nx, ny, iso_utils)
-                explosions_group.add(explosion)
-                all_sprites_group.add(explosion)
-
-    return explosion_particles, score_gained, spawned_powerups
+    for ny, nx in np.argwhere(bricks).tolist():
+        game_map[ny, nx] = 0
+
+        # Šance na spawn powerupu (20% chance)
+        if powerups_group is not None and random.random() < 0.2:
+            if powerup_pool is not None:
+                powerup = powerup_pool.acquire(nx, ny, iso_utils)
+            else:
+                from domain.entity.powerup import PowerUp
+                powerup = PowerUp(nx, ny, iso_utils)
+            powerups_group.add(powerup)
+            all_sprites_group.add(powerup)
+            spawned_powerups.append(powerup)
+
+        destroyed_bricks.append((nx, ny))
+
+    explosions.ignite(blast)
+
+    return detonated, destroyed_bricks, score_gained, spawned_powerups
+
+
+def create_brick_particles(iso_utils, destroyed_bricks):
+    """Vytvoří isometrické částice pro zničené zdi"""
+    explosion_particles = []
+    for nx, ny in destroyed_bricks:
+        screen_x, screen_y = iso_utils.grid_to_screen(nx, ny)
+        for _ in range(8):
+            explosion_particles.append({
+                'x': screen_x + random.randint(-20, 20),
+                'y': screen_y + random.randint(-20, 20),
+                'vx': random.uniform(-4, 4),
+                'vy': random.uniform(-6, 2),
+                'life': 40,
+                'color': (139, 69, 19)
+            })
+    return explosion_particles
 
 
 def check_collisions(player, enemies, explosions, lives, score):
-    """Zkontroluje kolize mezi hráčem a nepřáteli/explozemi pomocí pygame.sprite.collide"""
+    """
+    Zkontroluje kolize mezi hráčem a nepřáteli/explozemi
+
+    enemies je skupina indexovaná podle políčka (TileGroup) a explosions pole explozí (ExplosionField),
+    kolize je dotaz na jedno políčko
+    """
     collision_occurred = False
 
     # Zkontroluj imunitu hráče
     if player.immunity_timer > 0:
         return lives, collision_occurred
 
-    # Kolize s nepřáteli pomocí grid pozice
-    for enemy in enemies:
-        if enemy.grid_x == player.grid_x and enemy.grid_y == player.grid_y:
-            lives -= 1
-            collision_occurred = True
-            player.immunity_timer = 120  # 8 sekund imunity při 15 FPS
-            break
-
-    # Kolize s explozemi pomocí grid pozice
-    if not collision_occurred:
-        for explosion in explosions:
-            if explosion.grid_x == player.grid_x and explosion.grid_y == player.grid_y:
-                lives -= 1
-                collision_occurred = True
-                player.immunity_timer = 120  # 8 sekund imunity při 15 FPS
-                break
+    # Kolize s nepřáteli nebo explozemi na políčku hráče
+    if enemies.has(player.grid_x, player.grid_y) or explosions.has(player.grid_x, player.grid_y):
+        lives -= 1
+        collision_occurred = True
+        player.immunity_timer = 120  # 8 sekund imunity při 15 FPS
 
     # Reset pozice hráče při kolizi
     if collision_occurred and lives > 0:
         player.grid_x, player.grid_y = 1, 1
-        player.update_position()
 
     return lives, collision_occurred
 
 
 def check_enemy_explosions(enemies, explosions, score):
-    """Zkontroluje kolize nepřátel s explozemi pomocí grid pozice"""
+    """Zkontroluje kolize nepřátel s explozemi, explosions je pole explozí (ExplosionField) - dotaz na jedno políčko"""
     enemies_hit = []
 
     for enemy in enemies.copy():
-        # Kontrola kolize pomocí grid pozice
-        for explosion in explosions:
-            if explosion.grid_x == enemy.grid_x and explosion.grid_y == enemy.grid_y:
-                enemy.kill()
-                enemies_hit.append(enemy)
-                score += 100
-                break
+        if explosions.has(enemy.grid_x, enemy.grid_y):
+            enemy.kill()
+            enemies_hit.append(enemy)
+            score += 100
 
     return score, enemies_hit
 
 
 def count_destructible_blocks(game_map):
-    """Spočítá počet zbývajících zničitelných bloků (hodnota 2) na mapě"""
-    return np.sum(game_map == 2)
+    """Vrátí počet zbývajících zničitelných bloků (hodnota 2) na mapě, mapa si ho vede při každé změně"""
+    return game_map.brick_count
 
 
 def create_story_map(level, grid_width=15, grid_height=11):
     """Vytvoří mapu pro Story mode podle levelu - jednodušší a spolehlivější"""
     # Začni s prázdnou mapou
-    game_map = np.zeros((grid_height, grid_width), dtype=int)
+    game_map = GameMap(grid_width, grid_height)
 
     # Okraje jsou stěny
     game_map[0, :] = 1
@@ -284,4 +282,6 @@ def create_story_map(level, grid_width=15, grid_height=11):
                 if not is_important and random.random() < destructible_chance:
                     game_map[y, x] = 2
 
+    # vygenerovaná mapa začíná bez změn
+    game_map.clear_dirty()
     return game_map
\ No newline at end of file
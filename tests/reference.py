@@ -0,0 +1,86 @@
+"""Plain reference implementations the optimized structures are checked against"""
+import heapq
+from collections import deque
+
+import numpy as np
+
+INF = float('inf')
+NEIGHBOURS = ((0, -1), (0, 1), (-1, 0), (1, 0))
+
+
+def random_map(rng, height, width, density=0.3):
+    """Random map with walls (1) and bricks (2), the rest is empty"""
+    blocked = rng.random((height, width)) < density
+    return (blocked * rng.choice([1, 2], (height, width))).astype(np.uint8)
+
+
+def free_tiles(game_map):
+    """Returns (x, y) of all empty tiles"""
+    return [(int(x), int(y)) for y, x in np.argwhere(np.asarray(game_map) == 0)]
+
+
+def bfs_distances(game_map, source):
+    """Number of moves from source to every empty tile, -1 for unreachable tiles"""
+    game_map = np.asarray(game_map)
+    height, width = game_map.shape
+    distances = np.full((height, width), -1, dtype=int)
+    distances[source[1], source[0]] = 0
+    queue = deque([source])
+    while queue:
+        x, y = queue.popleft()
+        for dx, dy in NEIGHBOURS:
+            nx, ny = x + dx, y + dy
+            if 0 <= nx < width and 0 <= ny < height and game_map[ny, nx] == 0 and distances[ny, nx] < 0:
+                distances[ny, nx] = distances[y, x] + 1
+                queue.append((nx, ny))
+    return distances
+
+
+def dijkstra_cost_to_go(costs, target):
+    """Cheapest cost from every tile to target, a move costs the cost of the entered tile"""
+    height, width = costs.shape
+    distances = np.full((height, width), INF)
+    distances[target[1], target[0]] = 0
+    heap = [(0, target)]
+    while heap:
+        distance, (x, y) = heapq.heappop(heap)
+        if distance > distances[y, x] or costs[y, x] == INF:
+            continue
+        for dx, dy in NEIGHBOURS:
+            nx, ny = x + dx, y + dy
+            if 0 <= nx < width and 0 <= ny < height and distance + costs[y, x] < distances[ny, nx]:
+                distances[ny, nx] = distance + costs[y, x]
+                heapq.heappush(heap, (distances[ny, nx], (nx, ny)))
+    return distances
+
+
+def naive_blast(game_map, bombs, live_bombs):
+    """
+    Walks the rays of the bombs tile by tile including chain reactions, the whole batch sees
+    the map from the start
+
+    Returns:
+    --------
+        set of detonated bombs, bool mask of blast tiles, bool mask of hit bricks
+    """
+    game_map = np.asarray(game_map)
+    height, width = game_map.shape
+    blast = np.zeros((height, width), dtype=bool)
+    bricks = np.zeros((height, width), dtype=bool)
+    detonated = set()
+    wave = list(bombs)
+    while wave:
+        for bomb in wave:
+            detonated.add(bomb)
+            blast[bomb.grid_y, bomb.grid_x] = True
+            for dx, dy in ((0, 1), (0, -1), (1, 0), (-1, 0)):
+                for step in range(1, bomb.power + 1):
+                    x, y = bomb.grid_x + dx * step, bomb.grid_y + dy * step
+                    if not (0 <= x < width and 0 <= y < height) or game_map[y, x] == 1:
+                        break
+                    if game_map[y, x] == 2:
+                        bricks[y, x] = True
+                        break
+                    blast[y, x] = True
+        wave = [bomb for bomb in live_bombs if bomb not in detonated and blast[bomb.grid_y, bomb.grid_x]]
+    return detonated, blast, bricks
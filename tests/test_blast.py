@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+
+from tests.reference import free_tiles, naive_blast, random_map
+from utils.blast_reach import BlastReach
+from utils.blast_resolver import BlastResolver
+
+
+class Bomb:
+    def __init__(self, x, y, power):
+        self.grid_x = x
+        self.grid_y = y
+        self.power = power
+
+
+def naive_free(game_map, x, y, dx, dy):
+    count = 0
+    height, width = game_map.shape
+    x, y = x + dx, y + dy
+    while 0 <= x < width and 0 <= y < height and game_map[y, x] == 0:
+        count += 1
+        x, y = x + dx, y + dy
+    return count
+
+
+def assert_reach_matches_map(reach, game_map):
+    for d, (dx, dy) in enumerate(BlastReach.DIRECTIONS.tolist()):
+        for y in range(game_map.shape[0]):
+            for x in range(game_map.shape[1]):
+                assert reach.free[d, y, x] == naive_free(game_map, x, y, dx, dy)
+
+
+@pytest.mark.parametrize('seed', range(4))
+def test_reach_table_matches_naive_rays_after_destroyed_bricks(seed):
+    rng = np.random.default_rng(seed)
+    for _ in range(10):
+        height, width = rng.integers(2, 14, 2)
+        game_map = random_map(rng, height, width, density=0.4)
+        reach = BlastReach(game_map)
+        assert_reach_matches_map(reach, game_map)
+        bricks = np.argwhere(game_map == 2).tolist()
+        for y, x in bricks[:3]:
+            game_map[y, x] = 0
+            reach.on_brick_destroyed(x, y)
+            assert_reach_matches_map(reach, game_map)
+
+
+@pytest.mark.parametrize('seed', range(4))
+def test_resolver_matches_naive_rays_with_chain_reactions(seed):
+    rng = np.random.default_rng(seed)
+    for _ in range(40):
+        height, width = rng.integers(3, 16, 2)
+        game_map = random_map(rng, height, width)
+        tiles = free_tiles(game_map)
+        if not tiles:
+            continue
+        live_bombs = [Bomb(*tiles[i], int(rng.integers(1, 5)))
+                      for i in rng.choice(len(tiles), min(len(tiles), int(rng.integers(1, 8))), replace=False)]
+        bombs = live_bombs[:int(rng.integers(1, len(live_bombs) + 1))]
+        resolver = BlastResolver(game_map, BlastReach(game_map))
+
+        detonated, blast, bricks, score = resolver.resolve(bombs, live_bombs)
+        expected_detonated, expected_blast, expected_bricks = naive_blast(game_map, bombs, live_bombs)
+        assert set(detonated) == expected_detonated and len(detonated) == len(expected_detonated)
+        assert np.array_equal(blast, expected_blast)
+        assert np.array_equal(bricks, expected_bricks)
+        assert score == expected_bricks.sum() * BlastResolver.BRICK_SCORE
@@ -0,0 +1,167 @@
+import numpy as np
+import pytest
+
+from domain.state.game_map import GameMap
+from tests.reference import INF, bfs_distances, dijkstra_cost_to_go, free_tiles, random_map
+from utils.ai_workers import _next_on_path
+from utils.connectivity import ConnectivityIndex
+from utils.distance_field import DistanceField
+from utils.dstar_lite import DStarLite
+from utils.enemy_coordinator import EnemyCoordinator
+from utils.hpa_star import HierarchicalPathfinder
+
+
+class Walker:
+    def __init__(self, x, y):
+        self.grid_x = x
+        self.grid_y = y
+
+
+def random_costs(rng, height, width):
+    costs = np.ones((height, width))
+    costs[rng.random((height, width)) < 0.1] += DStarLite.BLAST_PENALTY
+    costs[rng.random((height, width)) < 0.25] = INF
+    return costs
+
+
+def destroy_bricks(rng, game_map, count, observer):
+    bricks = np.argwhere(np.asarray(game_map) == 2)
+    for y, x in bricks[rng.permutation(len(bricks))[:count]].tolist():
+        game_map[y, x] = 0
+        observer.on_brick_destroyed(x, y)
+
+
+@pytest.mark.parametrize('seed', range(4))
+def test_dstar_lite_matches_dijkstra_while_goal_and_costs_change(seed):
+    rng = np.random.default_rng(seed)
+    for _ in range(20):
+        height, width = rng.integers(3, 16, 2)
+        costs = random_costs(rng, height, width)
+        planner = DStarLite(np.zeros((height, width)))
+        start = (int(rng.integers(width)), int(rng.integers(height)))
+        goal = (int(rng.integers(width)), int(rng.integers(height)))
+        for _ in range(12):
+            change = rng.random()
+            if change < 0.3:
+                costs = costs.copy()
+                costs[rng.integers(height), rng.integers(width)] = rng.choice([1, 1 + DStarLite.BLAST_PENALTY, INF])
+            elif change < 0.6:
+                goal = (int(np.clip(goal[0] + rng.integers(-1, 2), 0, width - 1)), goal[1])
+            elif change < 0.8:
+                start = (start[0], int(np.clip(start[1] + rng.integers(-1, 2), 0, height - 1)))
+
+            next_tile = planner.next_tile(start, goal, costs)
+            expected = dijkstra_cost_to_go(costs, goal)
+            if start == goal or expected[start[1], start[0]] == INF:
+                assert next_tile is None
+                continue
+            assert planner.g[start[1] * width + start[0]] == expected[start[1], start[0]]
+            nx, ny = next_tile
+            assert costs[ny, nx] + expected[ny, nx] == expected[start[1], start[0]]
+
+
+@pytest.mark.parametrize('seed', range(4))
+def test_worker_astar_step_lies_on_a_cheapest_path(seed):
+    rng = np.random.default_rng(seed)
+    for _ in range(30):
+        height, width = rng.integers(3, 16, 2)
+        game_map = random_map(rng, height, width)
+        tiles = free_tiles(game_map)
+        if len(tiles) < 3:
+            continue
+        costs = random_costs(rng, height, width)
+        costs[game_map != 0] = INF
+        player = tiles[rng.integers(len(tiles))]
+        field = DistanceField(game_map)
+        field.compute(player)
+        flat_costs = costs.ravel().tolist()
+        flat_field = field.distances.ravel().tolist()
+
+        for _ in range(8):
+            start = tiles[rng.integers(len(tiles))]
+            target = tiles[rng.integers(len(tiles))]
+            expected = dijkstra_cost_to_go(costs, target)
+            next_index = _next_on_path(flat_costs, flat_field, width, start[1] * width + start[0],
+                                       target[1] * width + target[0])
+            if (start == target or expected[start[1], start[0]] == INF
+                    or not (field.is_reachable(*start) and field.is_reachable(*target))):
+                assert next_index is None
+                continue
+            nx, ny = next_index % width, next_index // width
+            assert costs[ny, nx] + expected[ny, nx] == expected[start[1], start[0]]
+
+
+@pytest.mark.parametrize('seed', range(4))
+def test_hpa_star_paths_are_valid_and_near_optimal(seed):
+    rng = np.random.default_rng(seed)
+    for _ in range(10):
+        height, width = rng.integers(5, 40, 2)
+        game_map = random_map(rng, height, width)
+        cluster_size = int(rng.integers(3, 11))
+        pathfinder = HierarchicalPathfinder(game_map, cluster_size)
+        for round_ in range(4):
+            if round_:
+                destroy_bricks(rng, game_map, 3, pathfinder)
+            tiles = free_tiles(game_map)
+            if len(tiles) < 2:
+                continue
+            for _ in range(6):
+                start = tiles[rng.integers(len(tiles))]
+                goal = tiles[rng.integers(len(tiles))]
+                shortest = bfs_distances(game_map, goal)[start[1], start[0]]
+                path = list(pathfinder.find_path(start, goal))
+                if shortest < 0:
+                    assert path == []
+                    continue
+                assert path[0] == start and path[-1] == goal
+                for (ax, ay), (bx, by) in zip(path, path[1:]):
+                    assert abs(ax - bx) + abs(ay - by) == 1 and game_map[by, bx] == 0
+                length = len(path) - 1
+                if length <= 2 * cluster_size:
+                    # krátké cesty hlídá přesné hledání v okolí startu
+                    assert length == shortest
+                assert length <= 2 * shortest
+
+
+@pytest.mark.parametrize('seed', range(4))
+def test_connectivity_matches_bfs_after_destroyed_bricks(seed):
+    rng = np.random.default_rng(seed)
+    for _ in range(30):
+        height, width = rng.integers(3, 20, 2)
+        game_map = random_map(rng, height, width, density=0.4)
+        index = ConnectivityIndex(game_map)
+        for round_ in range(4):
+            if round_:
+                destroy_bricks(rng, game_map, 1, index)
+            tiles = free_tiles(game_map)
+            if len(tiles) < 2:
+                continue
+            for _ in range(6):
+                a = tiles[rng.integers(len(tiles))]
+                b = tiles[rng.integers(len(tiles))]
+                assert index.same_region(a, b) == (bfs_distances(game_map, b)[a[1], a[0]] >= 0)
+
+
+@pytest.mark.parametrize('seed', range(4))
+def test_coordinator_steps_match_distance_field(seed):
+    rng = np.random.default_rng(seed)
+    for _ in range(20):
+        game_map = GameMap(15, 11)
+        game_map[:, :] = random_map(rng, 11, 15) != 0
+        tiles = free_tiles(game_map)
+        player = Walker(*tiles[0])
+        enemies = [Walker(*tiles[i]) for i in rng.choice(len(tiles), min(12, len(tiles)), replace=False)]
+        coordinator = EnemyCoordinator(game_map)
+        coordinator.assign(player, enemies)
+
+        for enemy in enemies:
+            assert coordinator.has_layers(enemy)
+            field = DistanceField(game_map)
+            field.compute(coordinator.get_target(enemy, (player.grid_x, player.grid_y)))
+            step = field.next_step(enemy.grid_x, enemy.grid_y)
+            expected = None if step is None else (enemy.grid_x + step[0], enemy.grid_y + step[1])
+            assert coordinator.next_tile(enemy) == expected
+
+        # změna mapy zneplatní rozdělení cílů
+        game_map[tiles[1][1], tiles[1][0]] = 1
+        assert not coordinator.has_layers(enemies[0])
@@ -0,0 +1,49 @@
+import numpy as np
+
+from utils.timer_wheel import TimerWheel
+
+
+def test_timers_fire_on_their_due_tick_across_laps():
+    wheel = TimerWheel(slots=16)
+    rng = np.random.default_rng(0)
+    fired = []
+    expected = {}
+    for timer in range(200):
+        delay = int(rng.integers(1, 60))
+        wheel.schedule(delay, lambda timer: fired.append((wheel.now, timer)), timer)
+        expected[timer] = delay
+
+    for _ in range(60):
+        wheel.advance()
+    assert sorted(fired) == sorted((due, timer) for timer, due in expected.items())
+    assert wheel.pending == 0 and wheel.fired == 200
+
+
+def test_cancelled_timer_does_not_fire_and_remaining_counts_down():
+    wheel = TimerWheel(slots=8)
+    fired = []
+    kept = wheel.schedule(5, fired.append, 'kept')
+    cancelled = wheel.schedule(5, fired.append, 'cancelled')
+    deadline = wheel.schedule(3)
+    cancelled.cancel()
+
+    for tick in range(1, 6):
+        wheel.advance()
+        assert kept.remaining == 5 - tick
+        assert deadline.remaining == max(0, 3 - tick)
+    assert fired == ['kept']
+
+
+def test_callback_may_reschedule_into_its_own_slot():
+    wheel = TimerWheel(slots=4)
+    fired = []
+
+    def repeat(count):
+        fired.append(wheel.now)
+        if count:
+            wheel.schedule(4, repeat, count - 1)
+
+    wheel.schedule(4, repeat, 2)
+    for _ in range(12):
+        wheel.advance()
+    assert fired == [4, 8, 12]
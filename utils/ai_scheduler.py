@@ -0,0 +1,115 @@
+import time
+from collections import deque
+
+
+class AIScheduler:
+    """
+    Class for time-sliced enemy thinking
+
+    enemies that are due to think are queued and each frame the queue is processed until the per-frame
+    budget (in milliseconds) is spent, the rest is carried over to the next frame.
+    The game runs several logic ticks in one rendered frame when it catches up, so it calls begin_frame
+    once per frame and all runs of that frame share one budget. Without begin_frame (headless simulation)
+    every run is a frame of its own.
+    At least one enemy thinks every frame, so nobody starves even with a tiny budget.
+    stagger spreads enemies over the think interval, so their decisions do not spike in the same frame.
+    """
+    def __init__(self, budget_ms=4.0):
+        self.budget_ms = budget_ms
+        self.queue = deque()
+        self._queued = set()
+        self.frame_driven = False  # snímky začíná volající (begin_frame), jinak je snímkem každé run
+        self.frame_open = False
+        self.frame_ms = 0.0  # čas přemýšlení v aktuálním snímku
+        self.frame_thinks = 0
+
+        # statistiky
+        self.frames = 0
+        self.thinks = 0
+        self.overrun_frames = 0  # snímky, kdy se rozpočet překročil nebo zbyla práce
+        self.carried_over = 0    # součet odložených rozhodnutí přes všechny snímky
+        self.max_queue_depth = 0
+        self.last_frame_ms = 0.0
+        self.max_frame_ms = 0.0
+
+    def stagger(self, enemies):
+        """Spreads move timers of the enemies evenly over their think interval"""
+        enemies = list(enemies)
+        for i, enemy in enumerate(enemies):
+            enemy.move_timer = (i * (enemy.THINK_INTERVAL + 1)) // len(enemies)
+
+    def enqueue(self, enemy):
+        if enemy not in self._queued:
+            self._queued.add(enemy)
+            self.queue.append(enemy)
+
+    def clear(self):
+        self.queue.clear()
+        self._queued.clear()
+
+    def begin_frame(self):
+        """Starts a new rendered frame, all runs until the next call share its budget"""
+        self.frame_driven = True
+        self._start_frame()
+
+    def _start_frame(self):
+        if self.frame_open:
+            self._end_frame()
+        self.frame_open = True
+        self.frame_ms = 0.0
+        self.frame_thinks = 0
+
+    def _end_frame(self):
+        self.frame_open = False
+        self.frames += 1
+        self.last_frame_ms = self.frame_ms
+        self.max_frame_ms = max(self.max_frame_ms, self.frame_ms)
+        if self.queue or self.frame_ms > self.budget_ms:
+            self.overrun_frames += 1
+            self.carried_over += len(self.queue)
+
+    def run(self, think):
+        """
+        Processes queued enemies within what is left of the budget of the current frame
+
+        Inputs:
+        -------
+        think : callable
+            called with the enemy, makes its decision and move
+        """
+        if not self.frame_driven or not self.frame_open:
+            self._start_frame()
+        self.max_queue_depth = max(self.max_queue_depth, len(self.queue))
+        start = time.perf_counter()
+        deadline = start + (self.budget_ms - self.frame_ms) / 1000.0
+        processed = 0
+
+        while self.queue:
+            if (processed > 0 or self.frame_thinks > 0) and time.perf_counter() >= deadline:
+                break
+            enemy = self.queue.popleft()
+            self._queued.discard(enemy)
+            if not enemy.alive():
+                continue
+            think(enemy)
+            processed += 1
+
+        self.thinks += processed
+        self.frame_thinks += processed
+        self.frame_ms += (time.perf_counter() - start) * 1000.0
+        if not self.frame_driven:
+            self._end_frame()
+
+    def get_stats(self):
+        """Returns scheduler counters as a dictionary"""
+        return {
+            'budget_ms': self.budget_ms,
+            'queue_depth': len(self.queue),
+            'max_queue_depth': self.max_queue_depth,
+            'frames': self.frames,
+            'thinks': self.thinks,
+            'overrun_frames': self.overrun_frames,
+            'carried_over': self.carried_over,
+            'last_frame_ms': self.last_frame_ms,
+            'max_frame_ms': self.max_frame_ms,
+        }
@@ -0,0 +1,238 @@
+import heapq
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from utils.distance_field import DistanceField
+from utils.dstar_lite import DStarLite
+
+
+# Sdílená paměť připojená ve worker procesu (jméno -> SharedMemory), aby se nepřipojovala při každé úloze
+_attached = {}
+
+
+def _attach(name):
+    block = _attached.get(name)
+    if block is None:
+        if len(_attached) >= 4:
+            # bloky z předchozích levelů už hlavní proces uvolnil
+            for old_block in _attached.values():
+                old_block.close()
+            _attached.clear()
+        # track=False - blok patří hlavnímu procesu, worker ho nesmí uvolnit (Python 3.13+)
+        try:
+            block = shared_memory.SharedMemory(name=name, track=False)
+        except TypeError:
+            block = shared_memory.SharedMemory(name=name)
+        _attached[name] = block
+    return block
+
+
+def _plan_chunk(grids_name, map_shape, positions_name, enemy_count, first, last):
+    """
+    Worker job - plans next tiles for enemies with index first..last-1
+
+    tile costs, distance field from the player and enemy positions with their targets are read from the shared
+    memory (see AIWorkerPool.publish), every enemy is then planned by A* over the costs toward its own target
+
+    Returns:
+    --------
+        list of (enemy index, start tile, next tile or None)
+    """
+    grids = _attach(grids_name).buf
+    costs = np.ndarray(map_shape, dtype=np.float64, buffer=grids)
+    field = np.ndarray(map_shape, dtype=np.int32, buffer=grids, offset=costs.nbytes)
+    positions = np.ndarray((enemy_count, 4), dtype=np.int32, buffer=_attach(positions_name).buf)
+
+    # Python seznamy jsou pro čtení po jednom políčku rychlejší než NumPy
+    costs = costs.ravel().tolist()
+    field = field.ravel().tolist()
+    width = map_shape[1]
+    results = []
+    for index in range(first, last):
+        x, y, target_x, target_y = positions[index].tolist()
+        next_index = _next_on_path(costs, field, width, y * width + x, target_y * width + target_x)
+        next_tile = (next_index % width, next_index // width) if next_index is not None else None
+        results.append((index, (x, y), next_tile))
+    return results
+
+
+def _next_on_path(costs, field, width, start, target):
+    """
+    A* over tile costs (see DStarLite.build_costs) from start to target, returns the second tile of the path
+
+    heuristic is the difference of distances from the player (field) - by the triangle inequality it never
+    overestimates and since the targets lie around the player it leads the search straight toward them
+    """
+    unreachable = DistanceField.UNREACHABLE
+    if start == target or field[start] == unreachable or field[target] == unreachable:
+        return None
+
+    target_distance = field[target]
+    size = len(costs)
+    g_score = {start: 0}
+    parents = {start: None}
+    open_heap = [(abs(field[start] - target_distance), 0, start)]
+    counter = 0
+    while open_heap:
+        _, _, current = heapq.heappop(open_heap)
+        if current == target:
+            break
+        x = current % width
+        for neighbour in (current - width, current + width, current - 1 if x > 0 else -1,
+                          current + 1 if x + 1 < width else -1):
+            if not 0 <= neighbour < size or costs[neighbour] == float('inf'):
+                continue
+            tentative = g_score[current] + costs[neighbour]
+            if tentative >= g_score.get(neighbour, float('inf')):
+                continue
+            g_score[neighbour] = tentative
+            parents[neighbour] = current
+            counter += 1
+            heu = abs(field[neighbour] - target_distance) if field[neighbour] != unreachable else 0
+            heapq.heappush(open_heap, (tentative + heu, counter, neighbour))
+
+    if target not in parents:
+        return None
+    node = target
+    while parents[node] != start:
+        node = parents[node]
+    return node
+
+
+class AIWorkerPool:
+    """
+    Class for optional process-pool AI backend
+
+    tile costs (bombs blocked, live blasts expensive - the same as for D* Lite), one distance field from the player
+    and enemy positions with their coordinator targets are published into multiprocessing.shared_memory,
+    pathfinding jobs are fanned out to a pool of worker processes in chunks and their results are collected
+    without blocking.
+    While a batch is still running the enemies keep applying their previous decision, so the game loop never stalls.
+    """
+    def __init__(self, processes=None, chunk_size=32):
+        self.processes = processes or max(1, (os.cpu_count() or 2) - 1)
+        self.chunk_size = chunk_size
+        self.executor = ProcessPoolExecutor(max_workers=self.processes)
+        self.grids_block = None  # ceny políček (float64) a za nimi pole vzdáleností od hráče (int32)
+        self.map_shape = None
+        self.positions_block = None
+        self.positions_capacity = 0
+        self.pending = []
+        self.published_enemies = []
+        self.decisions = {}  # enemy -> (start tile, next tile)
+
+        # statistiky
+        self.batches = 0
+        self.late_ticks = 0  # ticky, kdy výsledky ještě nebyly hotové
+
+    def _ensure_blocks(self, map_shape, enemy_count):
+        if self.map_shape != map_shape:
+            self._release(self.grids_block)
+            self.grids_block = shared_memory.SharedMemory(create=True, size=map_shape[0] * map_shape[1] * (8 + 4))
+            self.map_shape = map_shape
+        if enemy_count > self.positions_capacity:
+            self._release(self.positions_block)
+            self.positions_capacity = max(enemy_count, 2 * self.positions_capacity, 16)
+            self.positions_block = shared_memory.SharedMemory(create=True, size=self.positions_capacity * 4 * 4)
+
+    @staticmethod
+    def _release(block):
+        if block is not None:
+            block.close()
+            try:
+                block.unlink()
+            except FileNotFoundError:
+                pass
+
+    def publish(self, ai, player, enemies):
+        """
+        Publishes tile costs, the distance field and positions into shared memory and submits planning jobs
+
+        does nothing while the previous batch is still running
+
+        Inputs:
+        -------
+        ai : AIContext
+            game map, danger map, distance field and coordinator targets of the current tick
+        player
+            player the enemies are hunting
+        enemies
+            all living enemies
+        """
+        if self.pending:
+            return False
+
+        enemies = list(enemies)
+        if not enemies:
+            return False
+        game_map = ai.game_map
+        self._ensure_blocks(game_map.shape, len(enemies))
+        costs = np.ndarray(self.map_shape, dtype=np.float64, buffer=self.grids_block.buf)
+        costs[:] = DStarLite.build_costs(game_map, ai.danger_map)
+        # pole vzdáleností od hráče se spočítá jednou za dávku, všechny úlohy z něj berou heuristiku
+        player_tile = (player.grid_x, player.grid_y)
+        if ai.distance_field.source != player_tile:
+            ai.distance_field.compute(player_tile)
+        field = np.ndarray(self.map_shape, dtype=np.int32, buffer=self.grids_block.buf, offset=costs.nbytes)
+        field[:] = ai.distance_field.distances
+
+        # cíle z posledního rozdělení koordinátorem
+        positions = np.ndarray((self.positions_capacity, 4), dtype=np.int32, buffer=self.positions_block.buf)
+        for index, enemy in enumerate(enemies):
+            target = ai.coordinator.get_target(enemy, player_tile)
+            positions[index] = (enemy.grid_x, enemy.grid_y, target[0], target[1])
+
+        self.published_enemies = enemies
+        for first in range(0, len(enemies), self.chunk_size):
+            last = min(first + self.chunk_size, len(enemies))
+            self.pending.append(self.executor.submit(_plan_chunk, self.grids_block.name, self.map_shape,
+                                                     self.positions_block.name, self.positions_capacity,
+                                                     first, last))
+        self.batches += 1
+        return True
+
+    def collect(self):
+        """Takes over results of the finished batch, returns False if it is still running"""
+        if not self.pending:
+            return True
+        if not all(future.done() for future in self.pending):
+            self.late_ticks += 1
+            return False
+
+        alive = set(self.published_enemies)
+        for enemy in list(self.decisions):
+            if enemy not in alive:
+                del self.decisions[enemy]
+        for future in self.pending:
+            for index, start, next_tile in future.result():
+                self.decisions[self.published_enemies[index]] = (start, next_tile)
+        self.pending = []
+        return True
+
+    def get_next_tile(self, enemy):
+        """
+        Returns the last decision for the enemy
+
+        when the enemy has moved since the decision was made, the same direction is applied again
+        (move is validated by the enemy anyway), None if there is no decision yet or no path
+        """
+        decision = self.decisions.get(enemy)
+        if decision is None or decision[1] is None:
+            return None
+        start, next_tile = decision
+        if start == (enemy.grid_x, enemy.grid_y):
+            return next_tile
+        return enemy.grid_x + next_tile[0] - start[0], enemy.grid_y + next_tile[1] - start[1]
+
+    def close(self):
+        for future in self.pending:
+            future.cancel()
+        self.pending = []
+        self.executor.shutdown(wait=True, cancel_futures=True)
+        self._release(self.grids_block)
+        self._release(self.positions_block)
+        self.grids_block = None
+        self.positions_block = None
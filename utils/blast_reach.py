@@ -0,0 +1,99 @@
+import numpy as np
+
+
+class BlastReach:
+    """
+    Class for precomputed blast reach table
+
+    for every tile and direction it holds the number of empty tiles before the nearest wall, brick or map edge,
+    so the extent of a blast of any power is one lookup instead of walking the ray tile by tile.
+    When a brick is destroyed only its row and column are recomputed (map observer).
+    Bombs do not stop blasts and are not part of the table.
+    """
+    DIRECTIONS = np.array([(0, 1), (0, -1), (1, 0), (-1, 0)])  # stejné pořadí jako BlastResolver
+
+    def __init__(self, game_map):
+        self.game_map = game_map
+        self.height, self.width = game_map.shape
+        # free[d, y, x] = počet prázdných políček od (x, y) ve směru d
+        self.free = np.zeros((len(self.DIRECTIONS), self.height, self.width), dtype=np.int32)
+        self.updates = 0
+        self.rebuild()
+
+    def rebuild(self):
+        """Computes the whole table from the map"""
+        blocked = np.asarray(self.game_map) != 0
+        self._scan_lines(blocked, slice(None), slice(None))
+
+    def on_brick_destroyed(self, x, y):
+        """Map observer hook called by AIContext for a tile that became empty, recomputes its row and column"""
+        blocked = np.asarray(self.game_map) != 0
+        self._scan_lines(blocked, slice(y, y + 1), slice(x, x + 1))
+        self.updates += 1
+
+    def _scan_lines(self, blocked, rows, columns):
+        """Recomputes the vertical directions of the columns and the horizontal directions of the rows"""
+        free = self.free
+        # dolů (+y) a nahoru (-y) po sloupcích, doprava (+x) a doleva (-x) po řádcích
+        self._scan(blocked[:, columns].T, free[0][:, columns].T)
+        self._scan(blocked[::-1, columns].T, free[1][::-1, columns].T)
+        self._scan(blocked[rows, :], free[2][rows, :])
+        self._scan(blocked[rows, ::-1], free[3][rows, ::-1])
+
+    @staticmethod
+    def _scan(blocked, out):
+        """
+        Fills free tiles toward increasing index for every line at once
+
+        Inputs:
+        -------
+        blocked : 2d bool array
+            lines x positions, True for walls and bricks
+        out : 2d int array
+            view of the table with the same shape, written in place
+        """
+        length = blocked.shape[1]
+        out[:, length - 1] = 0
+        for i in range(length - 2, -1, -1):
+            out[:, i] = np.where(blocked[:, i + 1], 0, out[:, i + 1] + 1)
+
+    def cast(self, xs, ys, powers):
+        """
+        Returns all tiles reached by the rays of the bombs (the bomb tiles themselves are not included)
+
+        Inputs:
+        -------
+        xs, ys, powers : 1d int arrays
+            positions and powers of the bombs
+
+        Returns:
+        --------
+            index of the bomb, x and y of every reached tile and bool array telling which of them are bricks
+            (a brick is hit and stops the ray, a wall stops the ray and is not hit)
+        """
+        count = len(xs)
+        directions = len(self.DIRECTIONS)
+        ray_dir = np.tile(np.arange(directions), count)
+        origin_x = np.repeat(np.asarray(xs, dtype=np.intp), directions)
+        origin_y = np.repeat(np.asarray(ys, dtype=np.intp), directions)
+        power = np.repeat(np.asarray(powers, dtype=np.intp), directions)
+        step_x = self.DIRECTIONS[ray_dir, 0]
+        step_y = self.DIRECTIONS[ray_dir, 1]
+
+        free = self.free[ray_dir, origin_y, origin_x]
+        length = np.minimum(power, free)
+
+        # políčko za posledním prázdným - zeď, cihla nebo okraj mapy
+        end_x = origin_x + step_x * (free + 1)
+        end_y = origin_y + step_y * (free + 1)
+        end_brick = (free < power) & (end_x >= 0) & (end_x < self.width) & (end_y >= 0) & (end_y < self.height)
+        game_map = np.asarray(self.game_map)
+        end_brick &= game_map[np.where(end_brick, end_y, 0), np.where(end_brick, end_x, 0)] == 2
+
+        total = length + end_brick
+        ray = np.repeat(np.arange(count * directions), total)
+        starts = np.cumsum(total) - total
+        steps = np.arange(len(ray)) - starts[ray] + 1
+        cell_x = origin_x[ray] + step_x[ray] * steps
+        cell_y = origin_y[ray] + step_y[ray] * steps
+        return ray // directions, cell_x, cell_y, steps > length[ray]
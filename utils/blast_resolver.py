@@ -0,0 +1,96 @@
+import numpy as np
+
+
+class BlastResolver:
+    """
+    Class for resolving bomb blasts in batches
+
+    all bombs detonating in one tick are resolved together: rays of all bombs are cast at once from the reach table
+    (BlastReach), blast tiles of overlapping rays are merged into one mask
+    and bombs reached by the blast detonate in the next wave of the same tick (chain reaction).
+    Walls stop a ray, a brick stops it and is destroyed. The whole batch sees the map from the start of the tick,
+    so a brick shields the tiles behind it from every bomb of the batch.
+    """
+    BRICK_SCORE = 10
+
+    def __init__(self, game_map, reach):
+        """
+        Inputs:
+        -------
+        game_map : 2d array
+            game map
+        reach : BlastReach
+            reach table of the map, kept up to date as a map observer
+        """
+        self.game_map = game_map
+        self.reach = reach
+        self.height, self.width = game_map.shape
+        self.chain_detonations = 0  # bomby odpálené jinou bombou
+
+    def resolve(self, bombs, live_bombs=()):
+        """
+        Resolves detonation of the bombs including chain reactions
+
+        Inputs:
+        -------
+        bombs
+            bombs whose fuse ran out in this tick
+        live_bombs
+            all bombs on the map, those reached by the blast detonate too
+
+        Returns:
+        --------
+            list of detonated bombs, bool mask of blast tiles, bool mask of destroyed bricks, score for the bricks
+        """
+        blast = np.zeros((self.height, self.width), dtype=bool)
+        bricks = np.zeros((self.height, self.width), dtype=bool)
+
+        live_bombs = list(live_bombs)
+        live_x = np.array([bomb.grid_x for bomb in live_bombs], dtype=np.intp)
+        live_y = np.array([bomb.grid_y for bomb in live_bombs], dtype=np.intp)
+        live_done = np.zeros(len(live_bombs), dtype=bool)
+        live_index = {bomb: index for index, bomb in enumerate(live_bombs)}
+
+        detonated = []
+        seen = set()
+        wave = list(bombs)
+        while wave:
+            wave = [bomb for bomb in wave if bomb not in seen]
+            if not wave:
+                break
+            seen.update(wave)
+            detonated.extend(wave)
+            for bomb in wave:
+                if bomb in live_index:
+                    live_done[live_index[bomb]] = True
+            self.cast_rays(np.array([bomb.grid_x for bomb in wave], dtype=np.intp),
+                           np.array([bomb.grid_y for bomb in wave], dtype=np.intp),
+                           np.array([bomb.power for bomb in wave], dtype=np.intp),
+                           blast, bricks)
+
+            # řetězová reakce - bomby zasažené výbuchem vybuchnou v další vlně
+            if not live_bombs:
+                break
+            hit = blast[live_y, live_x] & ~live_done
+            wave = [live_bombs[index] for index in np.flatnonzero(hit).tolist()]
+            self.chain_detonations += len(wave)
+
+        return detonated, blast, bricks, int(bricks.sum()) * self.BRICK_SCORE
+
+    def cast_rays(self, xs, ys, powers, blast, bricks):
+        """
+        Marks tiles reached by the rays of the bombs, ray extents are read from the reach table
+
+        Inputs:
+        -------
+        xs, ys, powers : 1d int arrays
+            positions and powers of the bombs
+        blast : 2d bool array
+            reached tiles are set to True
+        bricks : 2d bool array
+            bricks that stopped a ray are set to True
+        """
+        blast[ys, xs] = True
+        _, cell_x, cell_y, brick = self.reach.cast(xs, ys, powers)
+        bricks[cell_y[brick], cell_x[brick]] = True
+        blast[cell_y[~brick], cell_x[~brick]] = True
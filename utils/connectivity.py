@@ -0,0 +1,90 @@
+import numpy as np
+
+
+class ConnectivityIndex:
+    """
+    Class for region labelling of the game map (union-find over empty tiles)
+
+    answers whether two tiles are connected in O(1) (amortized), so an enemy walled off from the player
+    does not have to search at all. Destroyed bricks only ever join regions,
+    so the index is updated incrementally by on_brick_destroyed, any other change needs rebuild.
+    """
+    def __init__(self, game_map):
+        self.game_map = game_map
+        self.height, self.width = game_map.shape
+        self.unions = 0
+        self.rebuild()
+
+    def rebuild(self):
+        """Labels all regions from the map"""
+        self.walkable = (np.asarray(self.game_map) == 0).ravel().tolist()
+        self.parent = list(range(self.width * self.height))
+        self.rank = [0] * (self.width * self.height)
+
+        # spoj každé prázdné políčko s pravým a dolním sousedem
+        width = self.width
+        walkable = self.walkable
+        for y in range(self.height):
+            for x in range(width):
+                index = y * width + x
+                if not walkable[index]:
+                    continue
+                if x + 1 < width and walkable[index + 1]:
+                    self.union(index, index + 1)
+                if y + 1 < self.height and walkable[index + width]:
+                    self.union(index, index + width)
+
+    def find(self, index):
+        """Returns representative of the region containing the tile with the flat index"""
+        parent = self.parent
+        root = index
+        while parent[root] != root:
+            root = parent[root]
+        # komprese cesty
+        while parent[index] != root:
+            parent[index], index = root, parent[index]
+        return root
+
+    def union(self, a, b):
+        root_a = self.find(a)
+        root_b = self.find(b)
+        if root_a == root_b:
+            return
+        if self.rank[root_a] < self.rank[root_b]:
+            root_a, root_b = root_b, root_a
+        self.parent[root_b] = root_a
+        if self.rank[root_a] == self.rank[root_b]:
+            self.rank[root_a] += 1
+        self.unions += 1
+
+    def on_brick_destroyed(self, x, y):
+        """Map observer hook called by AIContext for a tile that became empty, joins it with its neighbours"""
+        index = y * self.width + x
+        self.walkable[index] = True
+        for nx, ny in ((x, y - 1), (x, y + 1), (x - 1, y), (x + 1, y)):
+            if 0 <= nx < self.width and 0 <= ny < self.height and self.walkable[ny * self.width + nx]:
+                self.union(index, ny * self.width + nx)
+
+    def same_region(self, a, b):
+        """
+        Checks whether a path between two tiles can exist
+
+        Inputs:
+        -------
+        a : tuple
+            x and y of the first tile
+        b : tuple
+            x and y of the second tile
+
+        Returns:
+        --------
+            True if both tiles are empty and belong to the same region
+        """
+        if not (0 <= a[0] < self.width and 0 <= a[1] < self.height and
+                0 <= b[0] < self.width and 0 <= b[1] < self.height):
+            return False
+        index_a = a[1] * self.width + a[0]
+        index_b = b[1] * self.width + b[0]
+        if not (self.walkable[index_a] and self.walkable[index_b]):
+            return False
+        return self.find(index_a) == self.find(index_b)
@@ -0,0 +1,110 @@
+from collections import deque
+
+import numpy as np
+
+
+class DangerMap:
+    """
+    Class for shared blast-danger heatmap
+
+    it is built once per tick from all bombs and active explosions, every tile holds the number of ticks
+    until it is hit by a blast (0 for active explosions, SAFE when no blast reaches it).
+    Blasts follow the real cross shape of the bomb - rays of length bomb.power stopped by walls,
+    destructible walls are hit but stop the ray as well. Ray extents of all bombs are read at once
+    from the reach table (BlastReach).
+    Enemies (or any bot) then ask about a tile in O(1).
+    """
+    SAFE = np.iinfo(np.int32).max
+    MAX_ESCAPE_DEPTH = 8  # jak daleko nepřítel hledá bezpečné políčko
+
+    def __init__(self, game_map, reach):
+        self.game_map = game_map
+        self.reach = reach  # BlastReach sdílený s BlastResolver
+        self.height, self.width = game_map.shape
+        self.time_to_blast = np.full((self.height, self.width), self.SAFE, dtype=np.int32)
+        self.bomb_tiles = np.zeros((self.height, self.width), dtype=bool)
+
+    def build(self, bombs, explosions):
+        """
+        Rebuilds the heatmap
+
+        Inputs:
+        -------
+        bombs
+            placed bombs, uses grid_x, grid_y, timer and power
+        explosions : ExplosionField
+            active explosions
+        """
+        time_to_blast = self.time_to_blast
+        time_to_blast.fill(self.SAFE)
+        self.bomb_tiles.fill(False)
+
+        time_to_blast[explosions.active()] = 0
+
+        if not bombs:
+            return
+        xs = np.array([bomb.grid_x for bomb in bombs], dtype=np.intp)
+        ys = np.array([bomb.grid_y for bomb in bombs], dtype=np.intp)
+        timers = np.array([max(0, bomb.timer) for bomb in bombs], dtype=np.int32)
+        powers = np.array([bomb.power for bomb in bombs], dtype=np.intp)
+        self.bomb_tiles[ys, xs] = True
+        np.minimum.at(time_to_blast, (ys, xs), timers)
+
+        bomb_index, cell_x, cell_y, _ = self.reach.cast(xs, ys, powers)
+        np.minimum.at(time_to_blast, (cell_y, cell_x), timers[bomb_index])
+
+    def get_time_to_blast(self, x, y):
+        """Returns number of ticks until the tile is hit by a blast, SAFE if no blast reaches it"""
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return int(self.time_to_blast[y, x])
+        return self.SAFE
+
+    def is_safe(self, x, y):
+        return self.get_time_to_blast(x, y) == self.SAFE
+
+    def has_bomb(self, x, y):
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return bool(self.bomb_tiles[y, x])
+        return False
+
+    def find_escape_step(self, x, y):
+        """
+        Finds the first step toward the closest safe tile
+
+        searches (BFS) only walkable tiles without bombs and active explosions up to MAX_ESCAPE_DEPTH steps,
+        if there is no safe tile the step goes to the neighbour with most time left
+
+        Returns:
+        --------
+            (dx, dy) of the step, None when there is no better tile around
+        """
+        neighbours = ((0, -1), (0, 1), (-1, 0), (1, 0))
+        first_steps = {(x, y): None}
+        queue = deque([(x, y, 0)])
+        while queue:
+            cx, cy, depth = queue.popleft()
+            if depth > 0 and self.is_safe(cx, cy):
+                return first_steps[(cx, cy)]
+            if depth >= self.MAX_ESCAPE_DEPTH:
+                continue
+            for dx, dy in neighbours:
+                nx, ny = cx + dx, cy + dy
+                if (nx, ny) in first_steps or not self.is_passable(nx, ny):
+                    continue
+                first_steps[(nx, ny)] = first_steps[(cx, cy)] or (dx, dy)
+                queue.append((nx, ny, depth + 1))
+
+        # žádné bezpečné místo - aspoň tam, kde je víc času
+        best_step = None
+        best_time = self.get_time_to_blast(x, y)
+        for dx, dy in neighbours:
+            if self.is_passable(x + dx, y + dy) and self.get_time_to_blast(x + dx, y + dy) > best_time:
+                best_time = self.get_time_to_blast(x + dx, y + dy)
+                best_step = (dx, dy)
+        return best_step
+
+    def is_passable(self, x, y):
+        """Tile can be entered - it is empty, there is no bomb and no active explosion"""
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return False
+        return self.game_map.flat[y * self.width + x] == 0 and not self.bomb_tiles[y, x] and self.time_to_blast[y, x] > 0
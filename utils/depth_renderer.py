@@ -0,0 +1,38 @@
+class DepthRenderer:
+    """
+    Class for painter's algorithm rendering in depth buckets
+
+    isometric depth of a tile is grid_x + grid_y, so instead of sorting, every blit is dropped into the bucket
+    of its depth in O(1) and the buckets are drawn back to front by one Surface.blits call.
+    Each depth has two buckets - tiles first, then entities standing on tiles of that depth,
+    within a bucket blits keep the order they were added in.
+    """
+    def __init__(self):
+        self.buckets = []
+
+    def begin(self, depth_count):
+        """
+        Starts a new frame
+
+        Inputs:
+        -------
+        depth_count : int
+            number of depths on the map (grid_width + grid_height - 1)
+        """
+        if len(self.buckets) != 2 * depth_count:
+            self.buckets = [[] for _ in range(2 * depth_count)]
+        else:
+            for bucket in self.buckets:
+                bucket.clear()
+
+    def add_tile(self, depth, blit):
+        """Adds blit (surface, dest[, area]) of a tile of the depth"""
+        self.buckets[2 * depth].append(blit)
+
+    def add_sprite(self, depth, blit):
+        """Adds blit (surface, dest[, area]) of an entity standing on the depth, drawn over its tiles"""
+        self.buckets[2 * depth + 1].append(blit)
+
+    def draw(self, surface):
+        """Draws all buckets back to front, returns the changed rects"""
+        return surface.blits([blit for bucket in self.buckets for blit in bucket])
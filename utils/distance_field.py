@@ -0,0 +1,165 @@
+from collections import deque
+
+import numpy as np
+
+
+def advance_wavefront(frontier, visited, walkable, grown):
+    """
+    Moves the wavefront by one tile in all four directions, for one map (2d arrays)
+    or for a batch of layers over the same map at once (3d arrays, layers x height x width)
+
+    Inputs:
+    -------
+    frontier : bool array
+        tiles reached by the last step, replaced in place by the newly reached tiles
+    visited : bool array
+        tiles reached so far, the newly reached tiles are added
+    walkable : 2d bool array
+        tiles the wave can enter
+    grown : bool array
+        buffer with the shape of frontier
+
+    Returns:
+    --------
+        True if the wave reached any new tile
+    """
+    grown.fill(False)
+    grown[..., 1:, :] |= frontier[..., :-1, :]
+    grown[..., :-1, :] |= frontier[..., 1:, :]
+    grown[..., :, 1:] |= frontier[..., :, :-1]
+    grown[..., :, :-1] |= frontier[..., :, 1:]
+    np.logical_and(grown, walkable, out=frontier)
+    np.logical_and(frontier, ~visited, out=frontier)
+    if not frontier.any():
+        return False
+    visited |= frontier
+    return True
+
+
+class DistanceField:
+    """
+    Class for distance field (Dijkstra/BFS map) over the game map
+
+    distances from one source tile to every reachable tile are computed at once by NumPy wavefront
+    expansion. Any number of enemies can then pick their next step toward the source just by reading
+    the distances of their neighbours, so the cost per tick does not depend on the enemy count.
+    """
+    UNREACHABLE = np.iinfo(np.int32).max
+
+    def __init__(self, game_map):
+        self.game_map = game_map
+        self.height, self.width = game_map.shape
+        self.distances = np.full((self.height, self.width), self.UNREACHABLE, dtype=np.int32)
+        self.source = None
+
+        # předalokované buffery pro šíření vlny
+        self._visited = np.zeros((self.height, self.width), dtype=bool)
+        self._frontier = np.zeros((self.height, self.width), dtype=bool)
+        self._grown = np.zeros((self.height, self.width), dtype=bool)
+
+    def compute(self, source):
+        """
+        Computes distances from the source to all tiles
+
+        Inputs:
+        -------
+        source : tuple
+            x and y of the source tile (usually the player position)
+        """
+        self.source = (source[0], source[1])
+        distances = self.distances
+        distances.fill(self.UNREACHABLE)
+
+        sx, sy = self.source
+        walkable = np.asarray(self.game_map) == 0
+        if not (0 <= sx < self.width and 0 <= sy < self.height) or not walkable[sy, sx]:
+            return
+
+        visited = self._visited
+        frontier = self._frontier
+        grown = self._grown
+        visited.fill(False)
+        frontier.fill(False)
+        frontier[sy, sx] = True
+        visited[sy, sx] = True
+        distances[sy, sx] = 0
+
+        step = 0
+        while advance_wavefront(frontier, visited, walkable, grown):
+            step += 1
+            distances[frontier] = step
+
+    def invalidate(self):
+        """Marks the field as stale, next find_path recomputes it"""
+        self.source = None
+
+    def on_brick_destroyed(self, x, y):
+        """Map observer hook called by AIContext"""
+        self.invalidate()
+
+    def rebuild(self):
+        """Map observer hook called by AIContext after changes that are not destroyed bricks"""
+        self.invalidate()
+
+    def distance(self, x, y):
+        """Returns distance of the tile from the source, UNREACHABLE for walls and cut-off tiles"""
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return int(self.distances[y, x])
+        return self.UNREACHABLE
+
+    def is_reachable(self, x, y):
+        return self.distance(x, y) != self.UNREACHABLE
+
+    def next_step(self, x, y):
+        """
+        Returns the move toward the source from the entered tile
+
+        Inputs:
+        -------
+        x : int
+            x of the tile the step is taken from
+        y : int
+            y of the tile the step is taken from
+
+        Returns:
+        --------
+            (dx, dy) of the neighbour closest to the source, None when the tile is unreachable or is the source
+        """
+        best = self.distance(x, y)
+        if best == self.UNREACHABLE or best == 0:
+            return None
+
+        step = None
+        # stejné pořadí sousedů jako v AStar
+        for dx, dy in ((0, -1), (0, 1), (-1, 0), (1, 0)):
+            d = self.distance(x + dx, y + dy)
+            if d < best:
+                best = d
+                step = (dx, dy)
+        return step
+
+    def find_path(self, start, goal):
+        """
+        Same contract as AStar.find_path, the field is recomputed only if the goal is not its source
+        or the map has changed since the last computation
+
+        Returns:
+        --------
+            path as a list of positions from start to goal, empty when the goal cannot be reached
+        """
+        if self.source != (goal[0], goal[1]):
+            self.compute(goal)
+
+        path = deque()
+        if not self.is_reachable(start[0], start[1]):
+            return path
+
+        x, y = start
+        path.append((x, y))
+        step = self.next_step(x, y)
+        while step is not None:
+            x += step[0]
+            y += step[1]
+            path.append((x, y))
+            step = self.next_step(x, y)
+        return path
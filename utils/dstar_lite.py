@@ -0,0 +1,197 @@
+import heapq
+
+import numpy as np
+
+
+class DStarLite:
+    """
+    Class for incremental replanning (D* Lite) toward a moving goal
+
+    the search runs backward from the goal (player) to the start (enemy) and its state is kept between ticks.
+    When the enemy moves only the key modifier km grows, when a tile cost changes (brick destroyed,
+    bomb placed or exploded, blast appeared or disappeared) or the goal moves, only the affected
+    vertices are updated and the search repairs itself instead of starting from scratch.
+
+    Cost of a move is the cost of the entered tile (see build_costs), bombs and walls cannot be entered,
+    live blast tiles are expensive.
+    """
+    INF = float('inf')
+    BLAST_PENALTY = 20
+
+    def __init__(self, game_map):
+        self.height, self.width = game_map.shape
+        size = self.width * self.height
+        self.g = [self.INF] * size
+        self.rhs = [self.INF] * size
+        self.costs = None
+        self.open_heap = []
+        self.open_keys = {}  # index -> aktuální klíč, ostatní záznamy v haldě jsou zastaralé
+        self.km = 0
+        self.start = None
+        self.goal = None
+        self.expansions = 0  # počet expandovaných uzlů (pro měření)
+
+        self.neighbours = []
+        for index in range(size):
+            x, y = index % self.width, index // self.width
+            self.neighbours.append([ny * self.width + nx
+                                    for nx, ny in ((x, y - 1), (x, y + 1), (x - 1, y), (x + 1, y))
+                                    if 0 <= nx < self.width and 0 <= ny < self.height])
+
+    @classmethod
+    def build_costs(cls, game_map, danger_map):
+        """
+        Builds costs of entering every tile, shared by all planners for one tick
+
+        Inputs:
+        -------
+        game_map : 2d array
+            walls and destructible walls cannot be entered
+        danger_map : DangerMap
+            bombs cannot be entered, tiles with active explosion cost 1 + BLAST_PENALTY
+
+        Returns:
+        --------
+            2d float array with costs
+        """
+        costs = np.ones(game_map.shape, dtype=float)
+        costs[danger_map.time_to_blast == 0] += cls.BLAST_PENALTY
+        costs[(np.asarray(game_map) != 0) | danger_map.bomb_tiles] = cls.INF
+        return costs
+
+    def heuristic(self, a, b):
+        return abs(a % self.width - b % self.width) + abs(a // self.width - b // self.width)
+
+    def calculate_key(self, index):
+        best = min(self.g[index], self.rhs[index])
+        return (best + self.heuristic(self.start, index) + self.km, best)
+
+    def update_vertex(self, index):
+        if index != self.goal:
+            best = self.INF
+            costs = self.costs
+            g = self.g
+            for neighbour in self.neighbours[index]:
+                value = costs[neighbour] + g[neighbour]
+                if value < best:
+                    best = value
+            self.rhs[index] = best
+
+        if self.g[index] != self.rhs[index]:
+            key = self.calculate_key(index)
+            self.open_keys[index] = key
+            heapq.heappush(self.open_heap, (key, index))
+        else:
+            self.open_keys.pop(index, None)
+
+    def compute_shortest_path(self):
+        g = self.g
+        rhs = self.rhs
+        open_heap = self.open_heap
+        open_keys = self.open_keys
+        start = self.start
+
+        while open_heap:
+            key_old, index = open_heap[0]
+            if open_keys.get(index) != key_old:
+                heapq.heappop(open_heap)  # zastaralý záznam
+                continue
+            if not (key_old < self.calculate_key(start) or rhs[start] != g[start]):
+                break
+
+            heapq.heappop(open_heap)
+            del open_keys[index]
+            self.expansions += 1
+            key_new = self.calculate_key(index)
+            if key_old < key_new:
+                open_keys[index] = key_new
+                heapq.heappush(open_heap, (key_new, index))
+            elif g[index] > rhs[index]:
+                g[index] = rhs[index]
+                for neighbour in self.neighbours[index]:
+                    self.update_vertex(neighbour)
+            else:
+                g[index] = self.INF
+                self.update_vertex(index)
+                for neighbour in self.neighbours[index]:
+                    self.update_vertex(neighbour)
+
+    def initialize(self, start, goal, costs):
+        size = self.width * self.height
+        self.g = [self.INF] * size
+        self.rhs = [self.INF] * size
+        self.open_heap = []
+        self.open_keys = {}
+        self.km = 0
+        self.costs = costs.ravel().tolist()
+        self._costs_array = costs.copy()
+        self.start = start
+        self.goal = goal
+        self.rhs[goal] = 0
+        key = self.calculate_key(goal)
+        self.open_keys[goal] = key
+        heapq.heappush(self.open_heap, (key, goal))
+
+    def apply_changes(self, start, goal, costs):
+        """Repairs the search state after the enemy, the goal or tile costs have changed"""
+        if start != self.start:
+            self.km += self.heuristic(self.start, start)
+            self.start = start
+
+        # jen políčka, jejichž cena se změnila - vstup do nich mají jejich sousedé
+        changed = np.flatnonzero(costs != self._costs_array)
+        if len(changed):
+            self._costs_array = costs.copy()
+            flat_costs = self._costs_array.ravel()
+            affected = set()
+            for index in changed.tolist():
+                self.costs[index] = float(flat_costs[index])
+                affected.update(self.neighbours[index])
+            for index in affected:
+                self.update_vertex(index)
+
+        if goal != self.goal:
+            old_goal = self.goal
+            self.goal = goal
+            self.rhs[goal] = 0
+            self.update_vertex(goal)
+            self.update_vertex(old_goal)
+
+    def next_tile(self, start, goal, costs):
+        """
+        Returns the next tile on the cheapest path from start to goal
+
+        Inputs:
+        -------
+        start : tuple
+            x and y of the enemy
+        goal : tuple
+            x and y of the player
+        costs : 2d array
+            tile costs for this tick from build_costs
+
+        Returns:
+        --------
+            x and y of the next tile, None when the goal cannot be reached or start is the goal
+        """
+        start_index = start[1] * self.width + start[0]
+        goal_index = goal[1] * self.width + goal[0]
+        if self.goal is None:
+            self.initialize(start_index, goal_index, costs)
+        else:
+            self.apply_changes(start_index, goal_index, costs)
+        self.compute_shortest_path()
+
+        if start_index == goal_index or self.g[start_index] == self.INF:
+            return None
+
+        best = self.INF
+        best_index = None
+        for neighbour in self.neighbours[start_index]:
+            value = self.costs[neighbour] + self.g[neighbour]
+            if value < best:
+                best = value
+                best_index = neighbour
+        if best_index is None:
+            return None
+        return best_index % self.width, best_index // self.width
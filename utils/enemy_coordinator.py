@@ -0,0 +1,170 @@
+import numpy as np
+
+from utils.distance_field import advance_wavefront
+
+
+class EnemyCoordinator:
+    """
+    Class for cooperative target assignment of enemies
+
+    instead of all enemies chasing the exact player tile, walkable tiles around the player (approach tiles)
+    are handed out among them, so they come from different sides and do not trail behind each other.
+    Distances from every approach tile to every tile are computed by one batched NumPy wavefront
+    (one layer per approach tile), the distance matrix is then read at enemy positions and solved
+    greedily - the closest enemy-target pairs are taken first, every target is used at most once.
+    The layers are kept until the next assignment, so every enemy reads its next step right from the layer
+    of its target (next_tile) and no other search per enemy or per target is needed.
+    """
+    APPROACH_RADIUS = 2
+    UNREACHABLE = np.iinfo(np.int32).max
+
+    def __init__(self, game_map):
+        self.game_map = game_map
+        self.height, self.width = game_map.shape
+        self.targets = {}  # enemy -> přidělené políčko
+        self.layer_index = {}  # enemy -> vrstva vzdáleností k jeho cíli (0 je hráč)
+        self.layers = None
+        self.version = None  # verze mapy, pro kterou vrstvy platí
+        self.assignments = 0
+
+    def approach_tiles(self, player_tile):
+        """Returns walkable tiles reachable from the player within APPROACH_RADIUS steps, player tile first"""
+        px, py = player_tile
+        walkable = np.asarray(self.game_map) == 0
+        if not (0 <= px < self.width and 0 <= py < self.height) or not walkable[py, px]:
+            return [player_tile]
+
+        visited = np.zeros((self.height, self.width), dtype=bool)
+        visited[py, px] = True
+        frontier = visited.copy()
+        grown = np.zeros_like(frontier)
+        tiles = [player_tile]
+        for _ in range(self.APPROACH_RADIUS):
+            if not advance_wavefront(frontier, visited, walkable, grown):
+                break
+            ys, xs = np.nonzero(frontier)
+            tiles.extend(zip(xs.tolist(), ys.tolist()))
+        return tiles
+
+    def distance_matrix(self, sources, xs, ys):
+        """
+        Computes distances from every source to every position in one batched wavefront
+
+        Inputs:
+        -------
+        sources : list
+            x and y of the source tiles
+        xs, ys : 1d int arrays
+            positions the distances are read at
+
+        Returns:
+        --------
+            2d int32 array (sources x positions), UNREACHABLE where there is no path
+            the distance layers (sources x height x width) are kept in layers, the wavefront stops once
+            all positions are reached, so the layers cover the tiles up to the farthest position
+        """
+        walkable = np.asarray(self.game_map) == 0
+        count = len(sources)
+        distances = np.full((count, self.height, self.width), self.UNREACHABLE, dtype=np.int32)
+        frontier = np.zeros((count, self.height, self.width), dtype=bool)
+        layers = np.arange(count)
+        source_x = np.array([source[0] for source in sources], dtype=np.intp)
+        source_y = np.array([source[1] for source in sources], dtype=np.intp)
+        frontier[layers, source_y, source_x] = True
+        distances[layers, source_y, source_x] = 0
+        visited = frontier.copy()
+        grown = np.zeros_like(frontier)
+
+        step = 0
+        while True:
+            # dál není třeba, všechny pozice jsou ze všech zdrojů dosažené
+            if visited[:, ys, xs].all():
+                break
+            if not advance_wavefront(frontier, visited, walkable, grown):
+                break
+            step += 1
+            distances[frontier] = step
+        self.layers = distances
+        self.version = self.game_map.version
+        return distances[:, ys, xs]
+
+    def assign(self, player, enemies):
+        """
+        Hands approach tiles around the player out to the enemies, once per decision tick
+
+        Inputs:
+        -------
+        player
+            player the enemies are hunting
+        enemies
+            all living enemies
+        """
+        enemies = list(enemies)
+        self.targets = {}
+        self.layer_index = {}
+        if not enemies:
+            return self.targets
+
+        player_tile = (player.grid_x, player.grid_y)
+        sources = self.approach_tiles(player_tile)
+        xs = np.array([enemy.grid_x for enemy in enemies], dtype=np.intp)
+        ys = np.array([enemy.grid_y for enemy in enemies], dtype=np.intp)
+        matrix = self.distance_matrix(sources, xs, ys)
+
+        # hladové přiřazení - nejbližší dvojice cíl-nepřítel první, kdo nic nedostane, jde po hráči (vrstva 0)
+        self.layer_index = dict.fromkeys(enemies, 0)
+        taken_sources = set()
+        for flat in np.argsort(matrix, axis=None, kind='stable').tolist():
+            source, index = divmod(flat, len(enemies))
+            if matrix[source, index] == self.UNREACHABLE or len(taken_sources) == len(sources):
+                break
+            enemy = enemies[index]
+            if source in taken_sources or enemy in self.targets:
+                continue
+            taken_sources.add(source)
+            self.targets[enemy] = sources[source]
+            self.layer_index[enemy] = source
+        self.assignments += 1
+        return self.targets
+
+    def get_target(self, enemy, player_tile):
+        """
+        Returns the tile the enemy should go to
+
+        enemies without an assigned tile (more enemies than approach tiles) and enemies already standing
+        on their tile go for the player
+        """
+        target = self.targets.get(enemy)
+        if target is None or target == (enemy.grid_x, enemy.grid_y):
+            return player_tile
+        return target
+
+    def has_layers(self, enemy):
+        """Returns True if next_tile can answer for the enemy (it was assigned and the map has not changed)"""
+        return enemy in self.layer_index and self.version == self.game_map.version
+
+    def next_tile(self, enemy):
+        """
+        Returns the next tile of the enemy toward its target (see get_target), read from the distance layer
+        of the target kept by the last assignment
+
+        Returns:
+        --------
+            x and y of the neighbour closest to the target, None when the target is unreachable or reached
+        """
+        x, y = enemy.grid_x, enemy.grid_y
+        index = self.layer_index[enemy]
+        if self.targets.get(enemy) == (x, y):
+            index = 0  # stojí na svém políčku - jde po hráči
+        layer = self.layers[index]
+        best = layer[y, x]
+        if best == self.UNREACHABLE or best == 0:
+            return None
+
+        next_tile = None
+        # stejné pořadí sousedů jako v AStar
+        for nx, ny in ((x, y - 1), (x, y + 1), (x - 1, y), (x + 1, y)):
+            if 0 <= nx < self.width and 0 <= ny < self.height and layer[ny, nx] < best:
+                best = layer[ny, nx]
+                next_tile = (nx, ny)
+        return next_tile
@@ -0,0 +1,326 @@
+import heapq
+from collections import deque
+
+import numpy as np
+
+
+class HierarchicalPathfinder:
+    """
+    Class for hierarchical pathfinding (HPA*) on large maps
+
+    the map is split into square clusters (sectors). Walkable runs along every border between two clusters
+    are entrances, their transition tiles are nodes of an abstract graph, connected across the border (cost 1)
+    and inside the cluster by precomputed shortest distances. A query searches the small abstract graph
+    and then refines only the clusters along the coarse route.
+    When a brick is destroyed only its cluster (and its neighbours if the brick lies on a border) is rebuilt.
+
+    Enemies pursue only a few goals, so the abstract graph is searched backward from the goal by a resumable
+    Dijkstra kept per goal - each query only continues it until the nodes of its own cluster are settled
+    and later queries toward the same goal mostly just read it. Refined segments inside clusters are cached
+    until their cluster is rebuilt.
+
+    find_path keeps the AStar.find_path contract, paths are near-optimal, not exact - they may only cross cluster
+    borders at transition tiles (paths up to 2 * CLUSTER_SIZE long are checked by an exact search around the start).
+    """
+    CLUSTER_SIZE = 10
+    MAX_SINGLE_ENTRANCE = 6  # kratší vstupy mají jeden přechod uprostřed, delší dva na koncích
+    MAX_GOALS = 8  # pro kolik cílů se drží rozpracované hledání
+    GOAL = -1
+
+    def __init__(self, game_map, cluster_size=CLUSTER_SIZE):
+        self.game_map = game_map
+        self.height, self.width = game_map.shape
+        self.cluster_size = cluster_size
+        self.clusters_x = (self.width + cluster_size - 1) // cluster_size
+        self.clusters_y = (self.height + cluster_size - 1) // cluster_size
+        self.rebuilds = 0
+        self.rebuild()
+
+    def rebuild(self):
+        """Builds the whole abstract graph from the map"""
+        self.walkable = (np.asarray(self.game_map) == 0).ravel().tolist()
+        self.border_pairs = {}  # (cluster, right/lower cluster) -> [(tile, tile), ...]
+        self.inter_edges = {}   # tile -> set of tiles across the border
+        self.intra_edges = {}   # cluster -> {tile: {tile: cost}}
+        self.segments = {}      # cluster -> {(tile, tile): zjemněná cesta uvnitř clusteru}
+        self.goal_trees = {}    # goal tile -> rozpracovaný Dijkstra od cíle (viz _goal_tree)
+
+        for cy in range(self.clusters_y):
+            for cx in range(self.clusters_x):
+                if cx + 1 < self.clusters_x:
+                    self._build_border((cx, cy), (cx + 1, cy))
+                if cy + 1 < self.clusters_y:
+                    self._build_border((cx, cy), (cx, cy + 1))
+        for cy in range(self.clusters_y):
+            for cx in range(self.clusters_x):
+                self._build_intra((cx, cy))
+
+    def cluster_of(self, index):
+        return (index % self.width) // self.cluster_size, (index // self.width) // self.cluster_size
+
+    def cluster_bounds(self, cluster):
+        x0 = cluster[0] * self.cluster_size
+        y0 = cluster[1] * self.cluster_size
+        return x0, y0, min(x0 + self.cluster_size, self.width), min(y0 + self.cluster_size, self.height)
+
+    def _build_border(self, cluster_a, cluster_b):
+        """Finds entrances on the border between two neighbouring clusters (b is right of or below a)"""
+        for tile_a, tile_b in self.border_pairs.get((cluster_a, cluster_b), ()):
+            self.inter_edges[tile_a].discard(tile_b)
+            self.inter_edges[tile_b].discard(tile_a)
+
+        width = self.width
+        x0, y0, x1, y1 = self.cluster_bounds(cluster_a)
+        if cluster_b[0] != cluster_a[0]:
+            # svislá hranice - sloupec x1 - 1 proti sloupci x1
+            border = [(y * width + x1 - 1, y * width + x1) for y in range(y0, y1)]
+        else:
+            # vodorovná hranice - řádek y1 - 1 proti řádku y1
+            border = [((y1 - 1) * width + x, y1 * width + x) for x in range(x0, x1)]
+
+        pairs = []
+        run = []
+        for tile_a, tile_b in border + [(None, None)]:
+            if tile_a is not None and self.walkable[tile_a] and self.walkable[tile_b]:
+                run.append((tile_a, tile_b))
+                continue
+            if run:
+                if len(run) < self.MAX_SINGLE_ENTRANCE:
+                    pairs.append(run[len(run) // 2])
+                else:
+                    pairs.append(run[0])
+                    pairs.append(run[-1])
+                run = []
+
+        self.border_pairs[(cluster_a, cluster_b)] = pairs
+        for tile_a, tile_b in pairs:
+            self.inter_edges.setdefault(tile_a, set()).add(tile_b)
+            self.inter_edges.setdefault(tile_b, set()).add(tile_a)
+
+    def cluster_nodes(self, cluster):
+        """Returns transition tiles of the cluster"""
+        cx, cy = cluster
+        nodes = set()
+        for tile_a, tile_b in self.border_pairs.get(((cx - 1, cy), cluster), ()):
+            nodes.add(tile_b)
+        for tile_a, tile_b in self.border_pairs.get(((cx, cy - 1), cluster), ()):
+            nodes.add(tile_b)
+        for tile_a, tile_b in self.border_pairs.get((cluster, (cx + 1, cy)), ()):
+            nodes.add(tile_a)
+        for tile_a, tile_b in self.border_pairs.get((cluster, (cx, cy + 1)), ()):
+            nodes.add(tile_a)
+        return nodes
+
+    def _build_intra(self, cluster):
+        """Precomputes shortest distances between transition tiles inside the cluster"""
+        nodes = self.cluster_nodes(cluster)
+        edges = {}
+        for node in nodes:
+            distances, _ = self._local_search(node, cluster)
+            edges[node] = {other: distances[other] for other in nodes if other != node and other in distances}
+        self.intra_edges[cluster] = edges
+        self.segments[cluster] = {}
+
+    def _local_search(self, source, cluster, target=None):
+        """BFS restricted to the cluster, stops early when the target is reached"""
+        return self._search(source, self.cluster_bounds(cluster), target)
+
+    def _search(self, source, bounds, target=None, max_distance=None):
+        """BFS restricted to the bounds (x0, y0, x1, y1), stops at the target or beyond max_distance"""
+        x0, y0, x1, y1 = bounds
+        width = self.width
+        walkable = self.walkable
+        distances = {source: 0}
+        parents = {source: None}
+        queue = deque([source])
+        while queue:
+            current = queue.popleft()
+            if current == target or distances[current] == max_distance:
+                break
+            x, y = current % width, current // width
+            for nx, ny in ((x, y - 1), (x, y + 1), (x - 1, y), (x + 1, y)):
+                if not (x0 <= nx < x1 and y0 <= ny < y1):
+                    continue
+                neighbour = ny * width + nx
+                if neighbour in distances or not walkable[neighbour]:
+                    continue
+                distances[neighbour] = distances[current] + 1
+                parents[neighbour] = current
+                queue.append(neighbour)
+        return distances, parents
+
+    def _local_path(self, source, target, cluster):
+        distances, parents = self._local_search(source, cluster, target)
+        if target not in distances:
+            return None
+        path = []
+        node = target
+        while node is not None:
+            path.append(node)
+            node = parents[node]
+        path.reverse()
+        return path
+
+    def on_brick_destroyed(self, x, y):
+        """Map observer hook called by AIContext for a tile that became empty, rebuilds the affected clusters"""
+        index = y * self.width + x
+        self.walkable[index] = True
+        cluster = self.cluster_of(index)
+        cx, cy = cluster
+        x0, y0, x1, y1 = self.cluster_bounds(cluster)
+        rebuilt = [cluster]
+
+        # vstupy se mění jen pokud zeď ležela na hranici clusteru
+        if x == x0 and cx > 0:
+            self._build_border((cx - 1, cy), cluster)
+            rebuilt.append((cx - 1, cy))
+        if x == x1 - 1 and cx + 1 < self.clusters_x:
+            self._build_border(cluster, (cx + 1, cy))
+            rebuilt.append((cx + 1, cy))
+        if y == y0 and cy > 0:
+            self._build_border((cx, cy - 1), cluster)
+            rebuilt.append((cx, cy - 1))
+        if y == y1 - 1 and cy + 1 < self.clusters_y:
+            self._build_border(cluster, (cx, cy + 1))
+            rebuilt.append((cx, cy + 1))
+
+        for affected in rebuilt:
+            self._build_intra(affected)
+        self.goal_trees.clear()  # vzdálenosti k cílům už neplatí
+        self.rebuilds += 1
+
+    def find_path(self, start, goal):
+        """
+        returns a path from start to goal
+
+        Inputs:
+        -------
+        start : tuple
+            x and y of the start position
+        goal : tuple
+            x and y of the goal position
+
+        Returns:
+        --------
+            path as a list of positions, first position is the start position and last is the goal position
+            empty when the goal cannot be reached
+        """
+        width = self.width
+        if not (0 <= start[0] < width and 0 <= start[1] < self.height and
+                0 <= goal[0] < width and 0 <= goal[1] < self.height):
+            return deque()
+        source = start[1] * width + start[0]
+        target = goal[1] * width + goal[0]
+        if not (self.walkable[source] and self.walkable[target]):
+            return deque()
+
+        source_cluster = self.cluster_of(source)
+        distances, parents = self._local_search(source, source_cluster)
+        links = {node: distances[node] for node in self.cluster_nodes(source_cluster) if node in distances}
+        # přímo uvnitř clusteru, pokud tam cíl leží - cesta ven z clusteru ale může být kratší
+        best = distances.get(target, float('inf')) if self.cluster_of(target) == source_cluster else float('inf')
+        best_node = None
+
+        if links:
+            tree = self._goal_tree(target)
+            costs = tree['costs']
+            for node, distance in links.items():
+                if node in costs and distance + costs[node] < best:
+                    best, best_node = distance + costs[node], node
+            # nevyřízené uzly mají vzdálenost aspoň jako vrchol haldy, dál hledat nemá smysl
+            closest_link = min(links.values())
+            heap = tree['heap']
+            while heap and heap[0][0] + closest_link < best:
+                node, cost = self._settle(tree)
+                if node in links and links[node] + cost < best:
+                    best, best_node = links[node] + cost, node
+
+        if best == float('inf'):
+            return deque()
+
+        if best <= 2 * self.cluster_size:
+            # krátké cesty mohou přechody obcházet, v okolí startu se proto hledá ještě přesně
+            sx, sy = start
+            window = (max(0, sx - best), max(0, sy - best), min(width, sx + best + 1), min(self.height, sy + best + 1))
+            near_distances, near_parents = self._search(source, window, target, best - 1)
+            if target in near_distances:
+                best_node = None
+                parents = near_parents
+
+        if best_node is None:
+            node = target
+        else:
+            node = best_node
+        path = []
+        while node is not None:
+            path.append(node)
+            node = parents[node]
+        path.reverse()
+
+        if best_node is not None:
+            self._extend_route(path, best_node, tree)
+        return deque((node % width, node // width) for node in path)
+
+    def _goal_tree(self, target):
+        """Returns the backward search from the goal, started if there is none yet"""
+        tree = self.goal_trees.pop(target, None)
+        if tree is None:
+            if len(self.goal_trees) >= self.MAX_GOALS:
+                # zahoď nejstarší cíl
+                del self.goal_trees[next(iter(self.goal_trees))]
+            target_cluster = self.cluster_of(target)
+            distances, parents = self._local_search(target, target_cluster)
+            heap = [(distances[node], node, self.GOAL)
+                    for node in self.cluster_nodes(target_cluster) if node in distances]
+            heapq.heapify(heap)
+            # costs - vzdálenost uzlu k cíli, next - další uzel na cestě k cíli (GOAL pro poslední)
+            # parents - cesty z uzlů clusteru cíle k cíli
+            tree = {'costs': {}, 'next': {}, 'heap': heap, 'parents': parents}
+        self.goal_trees[target] = tree  # naposledy použitý cíl na konec
+        return tree
+
+    def _settle(self, tree):
+        """One step of the backward Dijkstra, returns the settled node and its cost (None when already settled)"""
+        cost, node, next_node = heapq.heappop(tree['heap'])
+        costs = tree['costs']
+        if node in costs:
+            return None, cost
+        costs[node] = cost
+        tree['next'][node] = next_node
+
+        heap = tree['heap']
+        for neighbour, edge_cost in self.intra_edges[self.cluster_of(node)].get(node, {}).items():
+            if neighbour not in costs:
+                heapq.heappush(heap, (cost + edge_cost, neighbour, node))
+        for partner in self.inter_edges.get(node, ()):
+            if partner not in costs:
+                heapq.heappush(heap, (cost + 1, partner, node))
+        return node, cost
+
+    def _extend_route(self, path, node, tree):
+        """Appends the refined route from the transition tile (last tile of the path) to the goal"""
+        following = tree['next']
+        next_node = following[node]
+        while next_node != self.GOAL:
+            cluster = self.cluster_of(node)
+            if cluster != self.cluster_of(next_node):
+                path.append(next_node)  # přechod přes hranici
+            else:
+                path.extend(self._segment(node, next_node, cluster))
+            node = next_node
+            next_node = following[node]
+
+        # z přechodu v clusteru cíle po cestě hledání od cíle
+        parents = tree['parents']
+        node = parents[node]
+        while node is not None:
+            path.append(node)
+            node = parents[node]
+
+    def _segment(self, source, target, cluster):
+        """Returns the path inside the cluster without its first tile, cached until the cluster is rebuilt"""
+        segments = self.segments[cluster]
+        segment = segments.get((source, target))
+        if segment is None:
+            segment = segments[(source, target)] = self._local_path(source, target, cluster)[1:]
+        return segment
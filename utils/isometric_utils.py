@@ -5,6 +5,15 @@ from .sprite_sheet import SpriteSheet
 
 class IsometricUtils:
     """Utility class for isometric coordinate conversions and rendering"""
+    # sprite sheet -> (velikost buňky, měřítko) snímků v atlasu
+    ATLAS_SHEETS = {
+        'player': (256, 0.25),
+        'enemy': (256, 0.25),
+        'bomb': (32, 1),
+        'explosion': (32, 1),
+    }
+    PLAYER_COLOR = (0, 150, 255)  # základní barva hráče - snímek ze sheetu se nebarví
+    PLAYER_TINTS = ((0, 150, 255), (0, 100, 200))  # normální a blikání při imunitě
     
     def __init__(self, tile_width=64, tile_height=32):
         self.tile_width = tile_width
@@ -28,12 +37,92 @@ class IsometricUtils:
             self.bomb_sheet = SpriteSheet(os.path.join(assets_dir, "bomb_sheet.png"))
             self.explosion_sheet = SpriteSheet(os.path.join(assets_dir, "explosion_sheet.png"))
             self.enemy_sheet = SpriteSheet(os.path.join(assets_dir, "player_sheet2_red.png"))
+            self.sheets = {
+                'player': self.player_sheet,
+                'enemy': self.enemy_sheet,
+                'bomb': self.bomb_sheet,
+                'explosion': self.explosion_sheet,
+            }
+            self.build_atlas()
+            self.build_variants()
             self.sprites_loaded = True
             print(f"Sprite sheety načteny úspěšně z: {assets_dir}")
         except Exception as e:
             print(f"Chyba při načítání sprite sheetů: {e}")
             self.sprites_loaded = False
         
+    def build_atlas(self):
+        """
+        Pre-slices every animation frame of the sprite sheets
+
+        frames are cut out, scaled and converted to the display format once and kept by (sheet, row, frame, scale),
+        create_*_sprite then only index into the atlas. The surfaces are shared - never draw into them.
+        """
+        self.atlas = {}
+        convert = pygame.display.get_surface() is not None  # convert_alpha potřebuje otevřené okno
+        for name, (cell, scale) in self.ATLAS_SHEETS.items():
+            sheet = self.sheets[name].sheet
+            for row in range(sheet.get_height() // cell):
+                for frame in range(sheet.get_width() // cell):
+                    sprite = self.sheets[name].get_sprite(frame * cell, row * cell, cell, cell, scale)
+                    self.atlas[(name, row, frame, scale)] = sprite.convert_alpha() if convert else sprite
+
+    def get_atlas_frame(self, name, row, frame):
+        """Returns the animation frame from the atlas, frames outside the sheet grid are sliced on first use"""
+        cell, scale = self.ATLAS_SHEETS[name]
+        key = (name, row, frame, scale)
+        sprite = self.atlas.get(key)
+        if sprite is None:
+            sprite = self.atlas[key] = self.sheets[name].get_sprite(frame * cell, row * cell, cell, cell, scale)
+        return sprite
+
+    def build_variants(self):
+        """
+        Bakes tinted and flipped variants of the character frames
+
+        every (frame, direction, tint, flipped) combination of the player (normal and immunity colour)
+        and of the red enemies is prepared once, blinking and turning around is then a dictionary lookup
+        """
+        self.variants = {}
+        for name, tints in (('player', self.PLAYER_TINTS), ('enemy', (None,))):
+            for _, row, frame, _ in [key for key in self.atlas if key[0] == name]:
+                for tint in tints:
+                    for flipped in (False, True):
+                        self.get_variant(name, row, frame, tint, flipped)
+
+    def get_variant(self, name, row, frame, tint=None, flipped=False):
+        """
+        Returns the frame from the atlas tinted and/or flipped, variants that were not baked are made on first use
+
+        Inputs:
+        -------
+        name : str
+            sheet of the atlas ('player', 'enemy')
+        row : int
+            row of the sheet (direction or enemy type)
+        frame : int
+            column of the sheet (animation frame)
+        tint : tuple, default None
+            colour multiplied over the frame, None or PLAYER_COLOR keep the original colours
+        flipped : bool
+            mirrored horizontally (facing left)
+        """
+        key = (name, row, frame, tint, flipped)
+        sprite = self.variants.get(key)
+        if sprite is None:
+            sprite = self.get_atlas_frame(name, row, frame)
+            if tint is not None and tint != self.PLAYER_COLOR:
+                # Jednoduchý color tint
+                colored_sprite = sprite.copy()
+                color_overlay = pygame.Surface(sprite.get_size(), pygame.SRCALPHA)
+                color_overlay.fill(tint + (128,))  # Přidej alpha
+                colored_sprite.blit(color_overlay, (0, 0), special_flags=pygame.BLEND_MULT)
+                sprite = colored_sprite
+            if flipped:
+                sprite = pygame.transform.flip(sprite, True, False)
+            self.variants[key] = sprite
+        return sprite
+
     def grid_to_screen(self, grid_x, grid_y, z=0):
         """Convert grid coordinates to screen coordinates"""
         screen_x = (grid_x - grid_y) * self.half_tile_width
@@ -130,22 +219,12 @@ class IsometricUtils:
         
         return surface
     
-    def create_character_sprite(self, base_color, direction=0, frame=0):
+    def create_character_sprite(self, base_color, direction=0, frame=0, flipped=False):
         """Create character sprite from sprite sheet or fallback to procedural"""
         if self.sprites_loaded:
             # Použij sprite sheet - správné pořadí: col (frame), row (direction)
-            sprite = self.player_sheet.get_sprite(frame * 256, direction * 256, 256, 256, scale=0.25)
-            
-            # Aplikuj barevný filtr pro imunitu/damage
-            if base_color != (0, 150, 255):  # Pokud není základní modrá
-                colored_sprite = sprite.copy()
-                # Jednoduchý color tint
-                color_overlay = pygame.Surface(sprite.get_size(), pygame.SRCALPHA)
-                color_overlay.fill(base_color + (128,))  # Přidej alpha
-                colored_sprite.blit(color_overlay, (0, 0), special_flags=pygame.BLEND_MULT)
-                return colored_sprite
-            
-            return sprite
+            # barevný filtr pro imunitu/damage i otočení jsou předpečené varianty
+            return self.get_variant('player', direction, frame, base_color, flipped)
         else:
             # Fallback na procedurální generování
             char_width = self.tile_width // 2
@@ -172,6 +251,8 @@ class IsometricUtils:
             pygame.draw.ellipse(surface, (0, 0, 0), body_rect, 2)
             pygame.draw.circle(surface, (0, 0, 0), head_center, head_radius, 2)
             
+            if flipped:
+                surface = pygame.transform.flip(surface, True, False)
             return surface
     
     def create_bomb_sprite(self, animation_frame=0):
@@ -179,8 +260,7 @@ class IsometricUtils:
         if self.sprites_loaded:
             # Použij sprite sheet - animace přes 4 snímky
             frame = animation_frame % 4
-            sprite = self.bomb_sheet.get_sprite(frame * 32, 0, 32, 32, scale=1)
-            return sprite
+            return self.get_atlas_frame('bomb', 0, frame)
         else:
             # Fallback na procedurální generování
             bomb_size = int(self.tile_width * 0.4)
@@ -209,8 +289,7 @@ class IsometricUtils:
         if self.sprites_loaded:
             # Použij sprite sheet - animace přes 4 snímky
             animation_frame = int((frame / max_frames) * 4) % 4
-            sprite = self.explosion_sheet.get_sprite(animation_frame * 32, 0, 32, 32, scale=1)
-            return sprite
+            return self.get_atlas_frame('explosion', 0, animation_frame)
         else:
             # Fallback na procedurální generování
             progress = frame / max_frames
@@ -239,21 +318,11 @@ class IsometricUtils:
             
             return surface
     
-    def get_render_order(self, entities):
-        """Sort entities by their render order (back to front)"""
-        def sort_key(entity):
-            # Sort by grid_y first (back to front), then by grid_x, then by z if available
-            z = getattr(entity, 'z', 0)
-            return (entity.grid_y + entity.grid_x, -z)
-        
-        return sorted(entities, key=sort_key)
-    
-    def create_enemy_sprite(self, enemy_type=0, frame=0):
+    def create_enemy_sprite(self, enemy_type=0, frame=0, flipped=False):
         """Create enemy sprite from sprite sheet or fallback to procedural"""
         if self.sprites_loaded:
             # Použij sprite sheet - enemy_type určuje řádek (0 nebo 1), frame určuje sloupec (0-3)
-            sprite = self.enemy_sheet.get_sprite(frame * 256, enemy_type * 256, 256, 256, scale=0.25)
-            return sprite
+            return self.get_variant('enemy', enemy_type, frame, flipped=flipped)
         else:
             # Fallback na procedurální generování
             enemy_size = int(self.tile_width * 0.4)
@@ -275,6 +344,8 @@ class IsometricUtils:
             # Outline
             pygame.draw.rect(surface, (0, 0, 0), (center - 8, center - 4, 16, 16), 2)
             
+            if flipped:
+                surface = pygame.transform.flip(surface, True, False)
             return surface
     
     def get_tile_center_offset(self):
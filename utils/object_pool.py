@@ -0,0 +1,51 @@
+class ObjectPool:
+    """
+    Class for pool of reusable objects
+
+    acquire hands out a released object reinitialised by its reset method (same arguments as the constructor)
+    and creates a new one only when there is none to reuse, release gives the object back.
+    Objects created and killed all the time (bombs, powerups, explosion views) are then allocated
+    only until the pool covers the busiest moment of the game.
+    """
+    def __init__(self, factory):
+        """
+        Inputs:
+        -------
+        factory : callable
+            creates a new object, usually the class, objects must have reset with the same arguments
+        """
+        self.factory = factory
+        self.free = []
+        self.created = 0
+        self.reused = 0
+        self.peak_in_use = 0
+
+    def acquire(self, *args):
+        """Returns an object initialised with args"""
+        if self.free:
+            item = self.free.pop()
+            item.reset(*args)
+            self.reused += 1
+        else:
+            item = self.factory(*args)
+            self.created += 1
+        self.peak_in_use = max(self.peak_in_use, self.in_use)
+        return item
+
+    def release(self, item):
+        """Returns the object to the pool, it must not be used by the caller any more"""
+        self.free.append(item)
+
+    @property
+    def in_use(self):
+        return self.created - len(self.free)
+
+    def get_stats(self):
+        """Returns pool occupancy as a dictionary"""
+        return {
+            'created': self.created,
+            'reused': self.reused,
+            'in_use': self.in_use,
+            'free': len(self.free),
+            'peak_in_use': self.peak_in_use,
+        }
@@ -0,0 +1,81 @@
+from itertools import islice
+
+
+class PathCache:
+    """
+    Class for versioned cache of pursuit paths
+
+    paths are stored as next hops (tile -> next tile toward the goal) grouped by the goal,
+    so an enemy keeps following its cached path and every other enemy standing anywhere on it gets a hit too.
+    The whole cache belongs to one version of the map journal (GameMap.version), when the map changes
+    (a brick is destroyed) all cached paths are dropped on the next lookup.
+    """
+    MAX_GOALS = 8  # kolik různých cílů (pozic hráče) si cache pamatuje
+
+    def __init__(self, game_map):
+        """
+        Inputs:
+        -------
+        game_map : GameMap
+            map the paths are found on, its version decides whether the cached paths are valid
+        """
+        self.game_map = game_map
+        self.version = game_map.version
+        self.hits = 0
+        self.misses = 0
+        self._next_hops = {}  # goal -> {tile: next tile or None}
+
+    def next_step(self, start, goal, find_path):
+        """
+        Returns the next tile on the path from start to goal
+
+        Inputs:
+        -------
+        start : tuple
+            x and y of the start position
+        goal : tuple
+            x and y of the goal position
+        find_path : callable
+            path finder with the AStar.find_path contract, called only on a cache miss
+
+        Returns:
+        --------
+            x and y of the next tile, None when the goal is unreachable or start is the goal
+        """
+        if self.version != self.game_map.version:
+            self.version = self.game_map.version
+            self._next_hops.clear()
+
+        start = (start[0], start[1])
+        goal = (goal[0], goal[1])
+        hops = self._next_hops.get(goal)
+        if hops is not None and start in hops:
+            self.hits += 1
+            return hops[start]
+
+        self.misses += 1
+        if hops is None:
+            if len(self._next_hops) >= self.MAX_GOALS:
+                # zahoď nejstarší cíl
+                del self._next_hops[next(iter(self._next_hops))]
+            hops = self._next_hops[goal] = {}
+
+        path = find_path(start, goal)
+        if len(path) == 0:
+            hops[start] = None  # cíl je nedosažitelný - platí do další změny mapy
+            return None
+
+        for tile, next_tile in zip(path, islice(path, 1, None)):
+            hops[tile] = next_tile
+        hops[path[-1]] = None
+        return hops.get(start)
+
+    def get_stats(self):
+        """Returns cache counters as a dictionary"""
+        lookups = self.hits + self.misses
+        return {
+            'version': self.version,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+        }
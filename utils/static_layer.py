@@ -0,0 +1,134 @@
+import pygame
+
+
+class StaticLayer:
+    """
+    Class for pre-rendered static layer of the board
+
+    the background and all floor, wall and brick tiles are drawn once into one surface in depth order,
+    every frame then starts with a single blit of it (screen shake is only the offset of that blit).
+    Tiles changed on the map (destroyed bricks) are redrawn just in their area, the whole layer is rebuilt
+    for a new map or when the biome changes (other tile sprites and background).
+    Entities are drawn over the layer, the tiles in front of them are blitted again over them (occluders).
+    """
+    TILE_NAMES = ('floor', 'wall', 'brick')
+    TILE_BOTTOMS = (40, 24, 32)  # posun spodní hrany sprajtu políčka pod izometrickou pozici
+
+    def __init__(self, size, iso_utils, camera_offset):
+        """
+        Inputs:
+        -------
+        size : tuple
+            width and height of the screen
+        iso_utils : IsometricUtils
+            isometric conversion
+        camera_offset : tuple
+            x and y of the map origin on the screen
+        """
+        self.surface = pygame.Surface(size)
+        self.iso_utils = iso_utils
+        self.camera_offset = camera_offset
+        self.game_map = None
+        self.sprites = None
+        self.background = None
+        self.version = None
+        self.pending = []  # změněná políčka od posledního překreslení
+        # pro každé políčko (index y * width + x) hloubka, jméno sprajtu a jeho obdélník na vrstvě
+        self.depths = []
+        self.names = []
+        self.rects = []
+        self.rebuilds = 0
+
+    def mark_dirty(self, cells):
+        """Remembers changed cells (x, y), they are redrawn by the next refresh"""
+        self.pending.extend(cells)
+
+    def refresh(self, game_map, sprites, background):
+        """
+        Brings the layer up to date with the map
+
+        Inputs:
+        -------
+        game_map : GameMap
+            the map being drawn
+        sprites : dict
+            tile sprites of the current biome ('floor', 'wall', 'brick')
+        background : Surface
+            background of the current biome
+        """
+        if game_map is not self.game_map or sprites is not self.sprites or background is not self.background:
+            self.rebuild(game_map, sprites, background)
+        elif self.pending or self.version != game_map.version:
+            # každá změna políčka zvyšuje verzi o jedna, jinak se mapa měnila mimo deník - celá znovu
+            if self.version + len(self.pending) != game_map.version:
+                self.rebuild(game_map, sprites, background)
+                return
+            for x, y in self.pending:
+                self._redraw_tile(x, y)
+            self.pending = []
+            self.version = game_map.version
+
+    def rebuild(self, game_map, sprites, background):
+        """Draws the whole layer"""
+        self.game_map = game_map
+        self.sprites = sprites
+        self.background = background
+        self.version = game_map.version
+        self.pending = []
+        self.rebuilds += 1
+
+        self.depths = []
+        self.names = []
+        self.rects = []
+        for y in range(game_map.height):
+            for x in range(game_map.width):
+                name, rect = self._tile_sprite(x, y)
+                self.depths.append(y + x)
+                self.names.append(name)
+                self.rects.append(rect)
+
+        self.surface.blit(background, (0, 0))
+        for index in sorted(range(len(self.rects)), key=lambda i: (self.depths[i], i)):
+            self.surface.blit(sprites[self.names[index]], self.rects[index])
+
+    def _tile_sprite(self, x, y):
+        """Returns name of the sprite of the tile and its rect on the layer"""
+        tile = self.game_map.flat[y * self.game_map.width + x]
+        name = self.TILE_NAMES[tile]
+        screen_x, screen_y = self.iso_utils.grid_to_screen(x, y)
+        rect = self.sprites[name].get_rect()
+        rect.centerx = screen_x + self.camera_offset[0] + self.iso_utils.half_tile_width
+        rect.bottom = screen_y + self.camera_offset[1] + self.iso_utils.tile_height + self.TILE_BOTTOMS[tile]
+        return name, rect
+
+    def _redraw_tile(self, x, y):
+        """Redraws the area of the changed tile - background and all tiles reaching into it in depth order"""
+        index = y * self.game_map.width + x
+        name, rect = self._tile_sprite(x, y)
+        area = rect.union(self.rects[index])
+        self.names[index] = name
+        self.rects[index] = rect
+
+        self.surface.set_clip(area)
+        self.surface.blit(self.background, area, area)
+        for other in sorted(area.collidelistall(self.rects), key=lambda i: (self.depths[i], i)):
+            self.surface.blit(self.sprites[self.names[other]], self.rects[other])
+        self.surface.set_clip(None)
+
+    def occluders(self, rect, depth):
+        """
+        Returns tiles that are drawn in front of an entity
+
+        Inputs:
+        -------
+        rect : Rect
+            rect of the entity on the layer (without screen shake)
+        depth : float
+            render depth of the entity
+
+        Returns:
+        --------
+            list of (depth, sprite name, tile rect) of tiles deeper than the entity overlapping its rect
+        """
+        return [(self.depths[index], self.names[index], self.rects[index])
+                for index in rect.collidelistall(self.rects) if self.depths[index] > depth]
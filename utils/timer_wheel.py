@@ -0,0 +1,92 @@
+class TimerHandle:
+    """
+    Class for one scheduled timer
+
+    remaining tells how many ticks are left until the timer is due, cancel prevents its callback from firing
+    """
+    def __init__(self, wheel, due, callback, args):
+        self.wheel = wheel
+        self.due = due
+        self.callback = callback
+        self.args = args
+        self.cancelled = False
+
+    @property
+    def remaining(self):
+        return max(0, self.due - self.wheel.now)
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class TimerWheel:
+    """
+    Class for timer wheel event scheduler
+
+    timers are kept in a ring of slots indexed by their due tick, advance moves the wheel by one tick and
+    fires callbacks from a single slot, so the cost per tick depends on the number of timers that fire,
+    not on the number of live objects. Timers longer than the wheel stay in their slot until the right lap.
+    Timers without a callback are plain deadlines - only their remaining ticks are read.
+    """
+    SLOTS = 512
+
+    def __init__(self, slots=SLOTS):
+        self.now = 0
+        self.slots = [[] for _ in range(slots)]
+        self.pending = 0
+        self.fired = 0
+
+    def schedule(self, delay, callback=None, *args):
+        """
+        Schedules a timer
+
+        Inputs:
+        -------
+        delay : int
+            in how many ticks the timer is due (at least 1)
+        callback : callable, default None
+            called with args when the timer is due, None for a plain deadline
+        args
+            arguments of the callback
+
+        Returns:
+        --------
+            TimerHandle
+        """
+        handle = TimerHandle(self, self.now + max(1, int(delay)), callback, args)
+        if callback is not None:
+            self.slots[handle.due % len(self.slots)].append(handle)
+            self.pending += 1
+        return handle
+
+    def advance(self):
+        """Moves the wheel by one tick and fires due timers, returns the number of fired callbacks"""
+        self.now += 1
+        index = self.now % len(self.slots)
+        slot = self.slots[index]
+        if not slot:
+            return 0
+
+        due = [handle for handle in slot if handle.due == self.now]
+        if not due:
+            return 0
+        # callbacky mohou plánovat do stejného slotu, proto se nahradí novým seznamem ještě před voláním
+        self.slots[index] = [handle for handle in slot if handle.due != self.now]
+        self.pending -= len(due)
+
+        fired = 0
+        for handle in due:
+            if handle.cancelled:
+                continue
+            handle.callback(*handle.args)
+            fired += 1
+        self.fired += fired
+        return fired
+
+    def get_stats(self):
+        """Returns scheduler counters as a dictionary"""
+        return {
+            'now': self.now,
+            'pending': self.pending,
+            'fired': self.fired,
+        }